@@ -3,11 +3,13 @@ from __future__ import annotations
 from typing import Optional, Tuple, TYPE_CHECKING
 
 import color
+import consts
+from entity import Item
 import exceptions
 
 if TYPE_CHECKING:
     from engine import Engine
-    from entity import Actor, Entity, Item
+    from entity import Actor, Entity
     from components.inventory import  Inventory
 
 class Action:
@@ -76,6 +78,7 @@ class MeleeAction(ActionWithDirection):
         else:
             attack_color = color.enemy_atk
 
+        self.engine.game_map.make_noise(target.x, target.y, consts.NOISE_RADIUS)
         if damage > 0:
             self.engine.message_log.add_message(f'{attack_desc} for {damage} DMG.', attack_color)
             target.fighter.hp -= damage
@@ -127,12 +130,12 @@ class PickUpAction(Action):
         actor_location_y = self.entity.y
         inventory = self.entity.inventory
 
-        for item in self.engine.game_map.items:
-            if actor_location_x == item.x and actor_location_y == item.y:
+        for item in self.engine.game_map.entities_at(actor_location_x, actor_location_y):
+            if isinstance(item, Item):
                 if len(inventory.items) >= inventory.capacity:
                     raise exceptions.Impossible(f'Your inventory is full.')
 
-                self.engine.game_map.entities.remove(item)
+                self.engine.game_map.remove_entity(item)
                 item.parent = self.entity.inventory
                 inventory.items.append(item)
 
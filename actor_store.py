@@ -0,0 +1,157 @@
+"""Struct-of-arrays storage for the actors of a `GameMap`.
+
+Every actor on a map owns one row of the store, its `store_id`.
+The row holds the actor's position, whether it is alive, and the stats of its `Fighter`, in contiguous NumPy arrays,
+so systems acting on many actors at once can work on whole arrays instead of looping over Python objects.
+
+The store is the only copy of the fighter stats while the actor is on the map, `Fighter` reads and writes its row.
+Positions are mirrored from `Entity.x` and `Entity.y` by `GameMap`, in the same way as its spatial index.
+When an actor leaves the map its stats are copied back into its `Fighter`, and its row is reused by the next actor.
+"""
+from __future__ import annotations
+
+import functools
+from typing import List, Optional, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from entity import Actor
+
+FIGHTER_FIELDS = ('hp', 'max_hp', 'base_def', 'base_pow')
+
+
+@functools.lru_cache(maxsize=None)
+def radius_mask(radius: float) -> np.ndarray:
+    """Return a read-only mask of the offsets within `radius` of its center tile, which is at `(reach, reach)`.
+
+    `reach` is `int(radius)`, the distance is the Euclidean metric of `Entity.distance`.
+    """
+    reach = int(radius)
+    dx, dy = np.ogrid[-reach:reach + 1, -reach:reach + 1]
+    mask = dx * dx + dy * dy <= radius * radius
+    mask.flags.writeable = False
+    return mask
+
+
+class ActorStore:
+    def __init__(self, capacity: int = 64):
+        self.x = np.zeros(capacity, dtype=np.int32)
+        self.y = np.zeros(capacity, dtype=np.int32)
+        self.hp = np.zeros(capacity, dtype=np.int32)
+        self.max_hp = np.zeros(capacity, dtype=np.int32)
+        self.base_def = np.zeros(capacity, dtype=np.int32)
+        self.base_pow = np.zeros(capacity, dtype=np.int32)
+        # `used` marks the rows owned by an actor, `alive` the rows of actors which can still act.
+        self.used = np.zeros(capacity, dtype=bool)
+        self.alive = np.zeros(capacity, dtype=bool)
+
+        self.actors: List[Optional[Actor]] = [None] * capacity
+        self._free: List[int] = list(range(capacity - 1, -1, -1))
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        # Arrays loaded from a save file can be read-only views of its data.
+        for name in ('x', 'y', 'used', 'alive', *FIGHTER_FIELDS):
+            array = getattr(self, name)
+            if not array.flags.writeable:
+                setattr(self, name, array.copy())
+
+    def __len__(self) -> int:
+        return len(self.actors) - len(self._free)
+
+    @property
+    def capacity(self) -> int:
+        return len(self.actors)
+
+    def add(self, actor: Actor) -> None:
+        """Give `actor` a row, filled from its current position and fighter stats."""
+        if not self._free:
+            self._grow()
+        store_id = self._free.pop()
+        fighter = actor.fighter
+        self.x[store_id] = actor.x
+        self.y[store_id] = actor.y
+        self.hp[store_id] = fighter._hp
+        self.max_hp[store_id] = fighter._max_hp
+        self.base_def[store_id] = fighter._base_def
+        self.base_pow[store_id] = fighter._base_pow
+        self.used[store_id] = True
+        self.alive[store_id] = actor.is_alive
+        self.actors[store_id] = actor
+        actor.store_id = store_id
+
+    def remove(self, actor: Actor) -> None:
+        """Release the row of `actor`, copying its fighter stats back into its `Fighter`."""
+        store_id = actor.store_id
+        fighter = actor.fighter
+        fighter._hp = self.hp.item(store_id)
+        fighter._max_hp = self.max_hp.item(store_id)
+        fighter._base_def = self.base_def.item(store_id)
+        fighter._base_pow = self.base_pow.item(store_id)
+        self.used[store_id] = False
+        self.alive[store_id] = False
+        self.actors[store_id] = None
+        self._free.append(store_id)
+        actor.store_id = None
+
+    def move(self, actor: Actor) -> None:
+        """Update the stored position of `actor` after it moved."""
+        self.x[actor.store_id] = actor.x
+        self.y[actor.store_id] = actor.y
+
+    def mark_dead(self, actor: Actor) -> None:
+        self.alive[actor.store_id] = False
+
+    def _grow(self) -> None:
+        old_capacity = self.capacity
+        new_capacity = old_capacity * 2
+        for name in ('x', 'y', 'used', 'alive', *FIGHTER_FIELDS):
+            old = getattr(self, name)
+            new = np.zeros(new_capacity, dtype=old.dtype)
+            new[:old_capacity] = old
+            setattr(self, name, new)
+        self.actors.extend([None] * old_capacity)
+        self._free.extend(range(new_capacity - 1, old_capacity - 1, -1))
+
+    def living_ids(self) -> np.ndarray:
+        """Return the rows of the living actors, in row order."""
+        return np.flatnonzero(self.alive)
+
+    def get(self, ids: np.ndarray) -> List[Actor]:
+        """Return the actors owning rows `ids`."""
+        actors = self.actors
+        return [actors[i] for i in ids.tolist()]
+
+    def distances(self, ids: np.ndarray, x: int, y: int) -> np.ndarray:
+        """Return the Euclidean distance from `(x, y)` to each actor of `ids`, the metric of `Entity.distance`."""
+        return np.hypot(self.x[ids] - x, self.y[ids] - y)
+
+    def in_radius(self, ids: np.ndarray, x: int, y: int, radius: float) -> np.ndarray:
+        """Return the subset of `ids` whose distance to `(x, y)` is at most `radius`."""
+        dx = self.x[ids] - x
+        dy = self.y[ids] - y
+        return ids[dx * dx + dy * dy <= radius * radius]
+
+    def in_mask(self, ids: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """Return the subset of `ids` standing on a True tile of the map-shaped `mask`, such as `GameMap.visible`."""
+        return ids[mask[self.x[ids], self.y[ids]]]
+
+    def nearest(self, ids: np.ndarray, x: int, y: int, max_distance: float) -> Optional[Actor]:
+        """Return the actor of `ids` closest to `(x, y)` and nearer than `max_distance`, or None."""
+        if not len(ids):
+            return None
+        distances = self.distances(ids, x, y)
+        closest = int(distances.argmin())
+        if distances[closest] >= max_distance:
+            return None
+        return self.actors[ids[closest]]
+
+    def damage(self, ids: np.ndarray, amount: int) -> List[Actor]:
+        """Subtract `amount` from the hp of the actors of `ids`, which must be unique.
+
+        Returns the living actors brought to 0 hp, it is up to the caller to make them `die`.
+        """
+        hp = np.maximum(self.hp[ids] - amount, 0)
+        self.hp[ids] = hp
+        return self.get(ids[(hp == 0) & self.alive[ids]])
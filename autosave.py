@@ -0,0 +1,95 @@
+"""Periodic autosaves, written on a background thread.
+
+The engine state is snapshotted on the main thread, which is quick. Compressing the snapshot and writing it to disk
+happens on a single background thread, so the frame loop never waits on disk.
+"""
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor
+import os
+import shutil
+import traceback
+from typing import Optional, TYPE_CHECKING
+
+import consts
+import savefile
+
+if TYPE_CHECKING:
+    from engine import Engine
+
+_executor: Optional[ThreadPoolExecutor] = None
+_pending: Optional[Future] = None
+
+
+def save_in_background(engine: Engine, filename: str) -> Future:
+    """Snapshot `engine` now, then compress and write it to `filename` on the background thread."""
+    global _executor, _pending
+    snapshot = savefile.snapshot(engine, directory=os.path.dirname(filename))
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='autosave')
+    _pending = _executor.submit(_write_snapshot, snapshot, filename)
+    return _pending
+
+
+def _write_snapshot(snapshot: savefile.Snapshot, filename: str) -> None:
+    try:
+        savefile.write_file(filename, savefile.encode(snapshot))
+    except Exception:
+        traceback.print_exc()
+        raise
+
+
+def is_saving() -> bool:
+    """Return True while a background save is still being written."""
+    return _pending is not None and not _pending.done()
+
+
+def wait() -> None:
+    """Block until the last background save has been written, if any.
+
+    Call this before writing or deleting the save file from the main thread.
+    """
+    if _pending is not None:
+        _pending.exception()  # Waits without raising, failures were already reported.
+
+
+def delete_save() -> None:
+    """Delete the save file, and the message archive and map layers it references.
+
+    Call this when the saved game ends, and before a new game starts writing its own files with the same names.
+    """
+    wait()  # An autosave still being written would bring the save back.
+    for filename in (consts.SAVE_FILENAME, consts.MESSAGE_ARCHIVE_FILENAME):
+        if os.path.exists(filename):
+            os.remove(filename)
+    shutil.rmtree(consts.LAYER_DIRECTORY, ignore_errors=True)
+
+
+class Autosaver:
+    """Decides when to autosave: every `interval` turns, and whenever the player reaches a new floor."""
+    def __init__(self, filename: str = consts.SAVE_FILENAME, interval: int = consts.AUTOSAVE_INTERVAL):
+        self.filename = filename
+        self.interval = interval
+        self._engine: Optional[Engine] = None
+        self._last_turn = 0
+        self._last_floor = 0
+
+    def update(self, engine: Engine) -> None:
+        """Start an autosave of `engine` if one is due. Call this after handling events."""
+        if engine is not self._engine:
+            # A new or loaded game, it doesn't need saving until something happens.
+            self._engine = engine
+            self._last_turn = engine.turn
+            self._last_floor = engine.game_world.current_floor
+            return
+
+        if not engine.player.is_alive or is_saving():
+            return  # A dead player's game is deleted, and a save still in progress is retried next time.
+
+        if (
+            engine.turn - self._last_turn >= self.interval
+            or engine.game_world.current_floor != self._last_floor
+        ):
+            self._last_turn = engine.turn
+            self._last_floor = engine.game_world.current_floor
+            save_in_background(engine, self.filename)
@@ -0,0 +1,271 @@
+"""Benchmarks for the game's hot paths.
+
+Every benchmark runs with fixed seeds, on maps from the default 80x43 up to 1000x1000, and with a varying number of
+monsters on the floor. Results are written as JSON so they can be compared between versions:
+
+    python benchmark.py --output bench.json
+    python benchmark.py --sizes 80x43,200x200 --entities 20,200 --repeat 3
+
+The per-object memory footprint of actors, items and messages is measured as well.
+"""
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import tcod
+
+import consts
+from engine import Engine
+import color
+import entity_factory
+from message_log import Message
+import procgen
+import setup_game
+
+DEFAULT_SIZES = [(80, 43), (200, 200), (500, 500), (1000, 1000)]
+DEFAULT_ENTITIES = [20, 200, 2000]
+DEFAULT_SEED = 1
+
+
+class Benchmark(NamedTuple):
+    """A named benchmark.
+
+    `setup` prepares an engine and returns the function to time.
+    If `uses_entities` is False then the benchmark is only run once per map size, on an engine of its own.
+    """
+    name: str
+    setup: Callable[[Engine, int], Callable[[], object]]
+    uses_entities: bool = True
+
+
+def max_rooms_for(map_width: int, map_height: int) -> int:
+    """Scale the number of room attempts with the map area, so bigger maps are as dense as the default one."""
+    return max(1, consts.ROOM_MAX_ROOMS * map_width * map_height // (consts.MAP_WIDTH * consts.MAP_HEIGHT))
+
+
+def build_engine(map_width: int, map_height: int, monsters: int, seed: int) -> Engine:
+    """Return a new game on a map of the given size, with exactly `monsters` monsters on it and no items.
+
+    The monsters and items placed by procgen are removed, so every entity count times the same floor layout.
+    The player is made unkillable so enemy turns can be repeated as often as needed.
+    """
+    engine = setup_game.new_game(
+        map_width=map_width,
+        map_height=map_height,
+        max_rooms=max_rooms_for(map_width, map_height),
+        pregenerate=False,  # Keep the background worker from competing with the timed code.
+        seed=seed,
+    )
+    engine.player.fighter.max_hp = engine.player.fighter.hp = 10 ** 9
+
+    game_map = engine.game_map
+    for entity in list(game_map.entities):
+        if entity is not engine.player:
+            game_map.remove_entity(entity)
+
+    xs, ys = np.nonzero(game_map.tiles['walkable'])
+    order = np.random.default_rng(seed).permutation(len(xs))
+    missing = monsters
+    for i in order.tolist():
+        if not missing:
+            break
+        x, y = int(xs[i]), int(ys[i])
+        if not game_map.get_blocking_entity_at_location(x, y):
+            entity_factory.orc.spawn(game_map, x, y)
+            missing -= 1
+    if missing:
+        raise ValueError(f'A {map_width}x{map_height} floor has no room for {monsters} monsters.')
+
+    engine.update_fov()
+    return engine
+
+
+def setup_procgen(engine: Engine, seed: int) -> Callable[[], object]:
+    game_world = engine.game_world
+
+    def run() -> object:
+        return procgen.generate_dungeon(
+            max_rooms=game_world.max_rooms,
+            room_min_size=game_world.room_min_size,
+            room_max_size=game_world.room_max_size,
+            map_width=game_world.map_width,
+            map_height=game_world.map_height,
+            engine=engine,
+        )
+    return run
+
+
+def setup_fov(engine: Engine, seed: int) -> Callable[[], object]:
+    return functools.partial(engine.update_fov, force=True)
+
+
+def setup_enemy_turns(engine: Engine, seed: int) -> Callable[[], object]:
+    return engine.handle_enemy_turns
+
+
+def setup_render(engine: Engine, seed: int) -> Callable[[], object]:
+    game_map = engine.game_map
+    console = tcod.Console(consts.SCREEN_WIDTH, consts.SCREEN_HEIGHT, order='F')
+    camera = engine.camera
+
+    def run() -> None:
+        game_map.render(console, camera)
+    return run
+
+
+def setup_save(engine: Engine, seed: int) -> Callable[[], object]:
+    filename = os.path.join(tempfile.mkdtemp(), 'benchmark.sav')
+    return lambda: engine.save_as(filename)
+
+
+def setup_load(engine: Engine, seed: int) -> Callable[[], object]:
+    filename = os.path.join(tempfile.mkdtemp(), 'benchmark.sav')
+    engine.save_as(filename)
+    return lambda: setup_game.load_game(filename)
+
+
+BENCHMARKS = [
+    Benchmark('procgen.generate_dungeon', setup_procgen, uses_entities=False),
+    Benchmark('Engine.update_fov', setup_fov),
+    Benchmark('Engine.handle_enemy_turns', setup_enemy_turns),
+    Benchmark('GameMap.render', setup_render),
+    Benchmark('Engine.save_as', setup_save),
+    Benchmark('setup_game.load_game', setup_load),
+]
+
+
+MEMORY_SUBJECTS: Dict[str, Callable[[], object]] = {
+    'memory.Actor': entity_factory.orc.build,
+    'memory.Item': entity_factory.health_potion.build,
+    'memory.Message': lambda: Message('The orc attacks the player for 3 DMG.', color.enemy_atk),
+}
+
+
+def measure_memory(count: int = 10_000) -> List[Dict[str, object]]:
+    """Return the average memory footprint of building `count` of each kind of object, components included."""
+    results = []
+    for name, build in MEMORY_SUBJECTS.items():
+        tracemalloc.start()
+        try:
+            objects = [build() for _ in range(count)]
+            allocated, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        del objects
+        results.append({'name': name, 'count': count, 'bytes_per_object': allocated / count})
+        print(f'{name:<28} {allocated / count:.0f} bytes per object', file=sys.stderr)
+    return results
+
+
+def time_function(function: Callable[[], object], repeat: int, number: int) -> List[float]:
+    """Return the time per call of `function`, for each of `repeat` batches of `number` calls."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        timings.append((time.perf_counter() - start) / number)
+    return timings
+
+
+def run_benchmarks(
+        benchmarks: Sequence[Benchmark],
+        sizes: Sequence[Tuple[int, int]],
+        entity_counts: Sequence[int],
+        *,
+        seed: int = DEFAULT_SEED,
+        repeat: int = 5,
+        number: int = 1,
+) -> List[Dict[str, object]]:
+    results = []
+
+    def record(benchmark: Benchmark, engine: Engine, uses_entities: bool) -> None:
+        # Counted before running, as benchmarks like procgen replace the floor.
+        monsters = sum(1 for _ in engine.game_map.actors) - 1 if uses_entities else None
+        entities = len(engine.game_map.entities) if uses_entities else None
+        timings = time_function(benchmark.setup(engine, seed), repeat, number)
+        result = {
+            'name': benchmark.name,
+            'map_width': engine.game_map.width,
+            'map_height': engine.game_map.height,
+            'monsters': monsters,
+            'entities': entities,
+            'seed': seed,
+            'repeat': repeat,
+            'number': number,
+            'min': min(timings),
+            'median': statistics.median(timings),
+            'mean': statistics.fmean(timings),
+        }
+        results.append(result)
+        print(
+            f"{benchmark.name:<28} {result['map_width']}x{result['map_height']:<6} "
+            f"entities={str(result['entities']):<6} min={result['min'] * 1000:.3f}ms",
+            file=sys.stderr,
+        )
+
+    for map_width, map_height in sizes:
+        for benchmark in benchmarks:
+            if not benchmark.uses_entities:
+                record(benchmark, build_engine(map_width, map_height, 0, seed), False)
+        for monsters in entity_counts:
+            engine = build_engine(map_width, map_height, monsters, seed)
+            for benchmark in benchmarks:
+                if benchmark.uses_entities:
+                    record(benchmark, engine, True)
+    return results
+
+
+def parse_size(text: str) -> Tuple[int, int]:
+    width, height = text.lower().split('x')
+    return int(width), int(height)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Time the hot paths of the game and report the results as JSON.')
+    parser.add_argument('--sizes', type=lambda text: [parse_size(size) for size in text.split(',')],
+                        default=DEFAULT_SIZES, help='comma separated map sizes, e.g. 80x43,1000x1000')
+    parser.add_argument('--entities', type=lambda text: [int(count) for count in text.split(',')],
+                        default=DEFAULT_ENTITIES, help='comma separated monster counts')
+    parser.add_argument('--only', default=None, help='only run benchmarks whose name contains this text')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--number', type=int, default=1, help='calls per timed batch')
+    parser.add_argument('--output', default=None, help='file to write the JSON results to, instead of stdout')
+    args = parser.parse_args(argv)
+
+    benchmarks = [benchmark for benchmark in BENCHMARKS if not args.only or args.only in benchmark.name]
+    memory = not args.only or any(args.only in name for name in MEMORY_SUBJECTS)
+    report = {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'tcod': tcod.__version__,
+        'platform': platform.platform(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'results': run_benchmarks(
+            benchmarks, args.sizes, args.entities, seed=args.seed, repeat=args.repeat, number=args.number,
+        ),
+        'memory': measure_memory() if memory else [],
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from typing import NamedTuple, Tuple
+
+import numpy as np
+
+
+class Camera(NamedTuple):
+    """The part of the map drawn on the screen.
+
+    `(x, y)` is the map position drawn at the top left of the console, and `width` and `height` the size of the view.
+    """
+    x: int
+    y: int
+    width: int
+    height: int
+
+    @classmethod
+    def following(cls, x: int, y: int, width: int, height: int, map_width: int, map_height: int) -> Camera:
+        """Return a camera centered on `(x, y)`, stopping at the edges of the map.
+
+        Along an axis where the map fits on the screen, it is drawn from the top left instead.
+        """
+        camera_x = 0 if map_width <= width else min(max(0, x - width // 2), map_width - width)
+        camera_y = 0 if map_height <= height else min(max(0, y - height // 2), map_height - height)
+        return cls(camera_x, camera_y, width, height)
+
+    def world_to_screen(self, x: int, y: int) -> Tuple[int, int]:
+        return x - self.x, y - self.y
+
+    def screen_to_world(self, x: int, y: int) -> Tuple[int, int]:
+        return x + self.x, y + self.y
+
+    def in_view(self, x: int, y: int) -> bool:
+        """Return True if the map position `(x, y)` is drawn on the screen."""
+        return 0 <= x - self.x < self.width and 0 <= y - self.y < self.height
+
+    def clip(self, map_width: int, map_height: int) -> Tuple[Tuple[slice, slice], Tuple[slice, slice]]:
+        """Return the part of a map that is in view, as a map region and the console region it is drawn to."""
+        x1, y1 = max(0, self.x), max(0, self.y)
+        x2, y2 = min(map_width, self.x + self.width), min(map_height, self.y + self.height)
+        x2, y2 = max(x1, x2), max(y1, y2)
+        return (
+            np.s_[x1:x2, y1:y2],
+            np.s_[x1 - self.x:x2 - self.x, y1 - self.y:y2 - self.y],
+        )
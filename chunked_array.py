@@ -0,0 +1,219 @@
+"""A 2D array stored in square chunks, for maps too large to hold as one NumPy array.
+
+A chunk is only allocated when something is written to it, until then it reads as the fill value.
+Cells are stored as one byte indexes into a palette of the distinct values written so far,
+so a chunk costs `chunk_size ** 2` bytes however large the dtype is.
+
+Indexing supports what the game uses on `GameMap.tiles`:
+a single cell `a[x, y]`, a rectangle `a[x1:x2, y1:y2]`, arrays of coordinates `a[xs, ys]`, and a boolean mask of the
+whole array, for reading and writing. `a['field']` returns a view of one field of a structured dtype, for reading.
+Reads return regular NumPy arrays.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, Tuple
+
+import numpy as np
+
+Key = Tuple[int, int]
+
+
+class ChunkedArray:
+    def __init__(self, shape: Tuple[int, int], fill_value: Any, chunk_size: int = 64):
+        self.shape = shape
+        self.chunk_size = chunk_size
+        self.palette = np.array([fill_value])
+        self.dtype = self.palette.dtype
+        # Chunks never written to are missing from `_chunks`, and read from this shared chunk of the fill value.
+        self._fill_chunk = np.zeros((chunk_size, chunk_size), dtype=np.uint8, order='F')
+        self._fill_chunk.flags.writeable = False
+        self._chunks: Dict[Key, np.ndarray] = {}
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        # Stack the chunks into one array, so a save stores them as a single section instead of thousands.
+        keys = list(self._chunks)
+        state['_chunks'] = (
+            np.array(keys, dtype=np.int32).reshape(-1, 2),
+            np.stack([self._chunks[key] for key in keys]) if keys else None,
+        )
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        keys, chunks = state.pop('_chunks')
+        self.__dict__.update(state)
+        # Loaded chunks can be read-only views of the save data, they are copied when first written to.
+        self._chunks = {(cx, cy): chunks[i] for i, (cx, cy) in enumerate(keys.tolist())}
+
+    @property
+    def allocated_chunks(self) -> int:
+        return len(self._chunks)
+
+    @property
+    def nbytes(self) -> int:
+        """Return the memory used by the allocated chunks."""
+        return len(self._chunks) * self.chunk_size ** 2 + self.palette.nbytes
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        array = self[:, :]
+        return array if dtype is None else array.astype(dtype)
+
+    def __getitem__(self, index) -> Any:
+        if isinstance(index, str):
+            return ChunkedField(self, index)
+        return self.palette[self._get_indexes(index)]
+
+    def __setitem__(self, index, value) -> None:
+        value = np.asarray(value, dtype=self.dtype)
+        if value.ndim == 0:
+            self._set_indexes(index, self._palette_index(value))
+        else:
+            unique, inverse = np.unique(value, return_inverse=True)
+            mapping = np.array([self._palette_index(item) for item in unique], dtype=np.uint8)
+            self._set_indexes(index, mapping[inverse.reshape(value.shape)])
+
+    def _palette_index(self, value: np.ndarray) -> int:
+        """Return the palette index of `value`, adding it to the palette if needed."""
+        found = np.flatnonzero(self.palette == value)
+        if len(found):
+            return int(found[0])
+        if len(self.palette) == 256:
+            raise ValueError('A ChunkedArray can only hold 256 distinct values.')
+        self.palette = np.append(self.palette, value[np.newaxis])
+        return len(self.palette) - 1
+
+    def _chunk(self, key: Key) -> np.ndarray:
+        return self._chunks.get(key, self._fill_chunk)
+
+    def _writable_chunk(self, key: Key) -> np.ndarray:
+        chunk = self._chunks.get(key)
+        if chunk is None or not chunk.flags.writeable:
+            chunk = self._chunks[key] = (self._fill_chunk if chunk is None else chunk).copy(order='F')
+        return chunk
+
+    def _normalize(self, index) -> Tuple[str, Any]:
+        """Classify `index` as a rectangle `('rect', (x1, x2, y1, y2, squeeze))` or points `('points', (xs, ys))`."""
+        if isinstance(index, np.ndarray) and index.dtype == bool:
+            if index.shape != self.shape:
+                raise IndexError(f'Boolean index of shape {index.shape} does not match {self.shape}.')
+            return 'mask', index
+        if not isinstance(index, tuple) or len(index) != 2:
+            raise IndexError(f'Unsupported index for ChunkedArray: {index!r}')
+        if all(isinstance(i, (slice, int, np.integer)) for i in index):
+            bounds = []
+            squeeze = []
+            for axis, (i, size) in enumerate(zip(index, self.shape)):
+                if isinstance(i, slice):
+                    start, stop, step = i.indices(size)
+                    if step != 1:
+                        raise IndexError('ChunkedArray slices do not support steps.')
+                    bounds.append((start, max(start, stop)))
+                else:
+                    i = int(i)
+                    if not -size <= i < size:
+                        raise IndexError(f'Index {i} is out of bounds for axis {axis} with size {size}.')
+                    i %= size
+                    bounds.append((i, i + 1))
+                    squeeze.append(axis)
+            (x1, x2), (y1, y2) = bounds
+            return 'rect', (x1, x2, y1, y2, tuple(squeeze))
+        xs, ys = np.broadcast_arrays(*(np.asarray(i, dtype=np.intp) for i in index))
+        for axis, (i, size) in enumerate(zip((xs, ys), self.shape)):
+            if i.size and (i.min() < -size or i.max() >= size):
+                raise IndexError(f'Index out of bounds for axis {axis} with size {size}.')
+        return 'points', (xs % self.shape[0], ys % self.shape[1])
+
+    def _rect_chunks(self, x1: int, x2: int, y1: int, y2: int) -> Iterator[Tuple[Key, slice, slice]]:
+        """Yield each chunk overlapping a rectangle, with the overlap in chunk coordinates and in rectangle ones."""
+        size = self.chunk_size
+        for cx in range(x1 // size, (x2 - 1) // size + 1 if x2 > x1 else x1 // size):
+            chunk_x1, chunk_x2 = max(x1, cx * size), min(x2, (cx + 1) * size)
+            for cy in range(y1 // size, (y2 - 1) // size + 1 if y2 > y1 else y1 // size):
+                chunk_y1, chunk_y2 = max(y1, cy * size), min(y2, (cy + 1) * size)
+                yield (
+                    (cx, cy),
+                    np.s_[chunk_x1 - cx * size:chunk_x2 - cx * size, chunk_y1 - cy * size:chunk_y2 - cy * size],
+                    np.s_[chunk_x1 - x1:chunk_x2 - x1, chunk_y1 - y1:chunk_y2 - y1],
+                )
+
+    def _point_groups(self, xs: np.ndarray, ys: np.ndarray) -> Iterator[Tuple[Key, np.ndarray]]:
+        """Group flat point arrays by chunk, yielding each chunk key with the positions of its points."""
+        size = self.chunk_size
+        chunk_ids = (xs // size) * (self.shape[1] // size + 1) + ys // size
+        order = np.argsort(chunk_ids, kind='stable')
+        sorted_ids = chunk_ids[order]
+        starts = np.flatnonzero(np.diff(sorted_ids, prepend=-1))
+        for start, stop in zip(starts.tolist(), [*starts[1:].tolist(), len(order)]):
+            positions = order[start:stop]
+            first = positions[0]
+            yield (int(xs[first]) // size, int(ys[first]) // size), positions
+
+    def _get_indexes(self, index) -> np.ndarray:
+        if type(index) is tuple and len(index) == 2 and type(index[0]) is int and type(index[1]) is int:
+            # Fast path for the single tile lookups of the game logic.
+            x, y = index
+            if 0 <= x < self.shape[0] and 0 <= y < self.shape[1]:
+                size = self.chunk_size
+                return self._chunk((x // size, y // size))[x % size, y % size]
+        kind, value = self._normalize(index)
+        if kind == 'mask':
+            kind, value = 'points', np.nonzero(value)
+        if kind == 'rect':
+            x1, x2, y1, y2, squeeze = value
+            out = np.empty((x2 - x1, y2 - y1), dtype=np.uint8, order='F')
+            for key, chunk_region, out_region in self._rect_chunks(x1, x2, y1, y2):
+                out[out_region] = self._chunk(key)[chunk_region]
+            return out.squeeze(squeeze) if squeeze else out
+        xs, ys = value
+        shape = xs.shape
+        xs, ys = xs.ravel(), ys.ravel()
+        out = np.empty(len(xs), dtype=np.uint8)
+        size = self.chunk_size
+        for key, positions in self._point_groups(xs, ys):
+            out[positions] = self._chunk(key)[xs[positions] % size, ys[positions] % size]
+        return out.reshape(shape)
+
+    def _set_indexes(self, index, indexes) -> None:
+        kind, value = self._normalize(index)
+        indexes = np.asarray(indexes, dtype=np.uint8)
+        if kind == 'mask':
+            if indexes.ndim == 0:
+                # Write chunk by chunk, skipping the chunks the mask doesn't touch.
+                for key, chunk_region, mask_region in self._rect_chunks(0, self.shape[0], 0, self.shape[1]):
+                    mask = value[mask_region]
+                    if mask.any():
+                        self._writable_chunk(key)[chunk_region][mask] = indexes
+                return
+            kind, value = 'points', np.nonzero(value)
+        if kind == 'rect':
+            x1, x2, y1, y2, squeeze = value
+            indexes = np.broadcast_to(
+                np.expand_dims(indexes, squeeze) if squeeze and indexes.ndim else indexes, (x2 - x1, y2 - y1),
+            )
+            for key, chunk_region, value_region in self._rect_chunks(x1, x2, y1, y2):
+                self._writable_chunk(key)[chunk_region] = indexes[value_region]
+            return
+        xs, ys = value
+        indexes = np.broadcast_to(indexes, xs.shape).ravel()
+        xs, ys = xs.ravel(), ys.ravel()
+        size = self.chunk_size
+        for key, positions in self._point_groups(xs, ys):
+            self._writable_chunk(key)[xs[positions] % size, ys[positions] % size] = indexes[positions]
+
+
+class ChunkedField:
+    """A read-only view of one field of a structured `ChunkedArray`."""
+    def __init__(self, parent: ChunkedArray, name: str):
+        self.parent = parent
+        self.name = name
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.parent.shape
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        array = self[:, :]
+        return array if dtype is None else array.astype(dtype)
+
+    def __getitem__(self, index) -> Any:
+        return self.parent.palette[self.name][self.parent._get_indexes(index)]
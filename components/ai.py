@@ -1,9 +1,7 @@
 from __future__ import annotations
 
-import random
 from typing import List, Optional, Tuple, TYPE_CHECKING
 
-import numpy as np
 import tcod
 
 from actions import (
@@ -23,28 +21,17 @@ class BaseAI(Action):
     def perform(self) -> None:
         raise NotImplementedError()
 
-    def get_path_to(self, dest_x: int, dest_y: int) -> List[Tuple[int, int]]:
-        """Compute and return a path to the target position.
+    def get_path_to_player(self) -> List[Tuple[int, int]]:
+        """Return a path to the player by descending the engine's shared flow field.
 
         If there is no valid path, then return an empty list.
         """
-        cost = np.array(self.entity.gamemap.tiles['walkable'], dtype=np.int8)
-        for entity in self.entity.gamemap.entities:
-            # Check that an entity blocks movement and the cost isn't zero (blocking.
-            if entity.blocks_movement and cost[entity.x, entity.y]:
-                """Add to the cost of a blocked position.
-                A lower number means more enemies wil lcrowd behind each other in hallways.
-                A higher number means enemies will take longer paths in order to surround the player.
-                """
-                cost[entity.x, entity.y] += 10
-
-        graph = tcod.path.SimpleGraph(cost=cost, cardinal=2, diagonal=3)
-        pathfinder = tcod.path.Pathfinder(graph)
-
-        pathfinder.add_root((self.entity.x, self.entity.y))  # start position
-        # Compute the path to the destination, and remove the starting position
-        path: List[List[int]] = pathfinder.path_to((dest_x, dest_y))[1:].tolist()
-        return [(index[0], index[1]) for index in path]
+        distance, (origin_x, origin_y) = self.engine.flow_field
+        x, y = self.entity.x - origin_x, self.entity.y - origin_y
+        if not (0 <= x < distance.shape[0] and 0 <= y < distance.shape[1]):
+            return []
+        path: List[List[int]] = tcod.path.hillclimb2d(distance, (x, y), True, True)[1:].tolist()
+        return [(index[0] + origin_x, index[1] + origin_y) for index in path]
 
 
 class ConfusedEnemy(BaseAI):
@@ -67,7 +54,7 @@ class ConfusedEnemy(BaseAI):
             self.entity.ai = self.previous_ai
         else:
             # Pick a random direction
-            dir_x, dir_y = random.choice(
+            dir_x, dir_y = self.engine.game_world.rng('ai').choice(
                 [
                     (-1, -1),  # Up Left
                     (0, -1),    # Up
@@ -99,10 +86,13 @@ class HostileEnemy(BaseAI):
         if self.engine.game_map.visible[self.entity.x, self.entity.y]:
             if distance <= 1:
                 return MeleeAction(self.entity, dx, dy).perform()
-            self.path = self.get_path_to(target.x, target.y)
+            self.path = self.get_path_to_player()
 
         if self.path:
             dest_x, dest_y = self.path.pop(0)
             return MovementAction(self.entity, dest_x - self.entity.x, dest_y - self.entity.y).perform()
 
+        if not self.engine.game_map.in_activity_zone(self.entity.x, self.entity.y):
+            # Out of sight with nowhere to go, this enemy would only wait until the player comes near.
+            self.engine.game_map.sleep(self.entity)
         return WaitAction(self.entity).perform()
\ No newline at end of file
@@ -19,6 +19,8 @@ if TYPE_CHECKING:
 
 
 class Consumable(BaseComponent):
+    __slots__ = ()
+
     parent: Item
 
     def get_action(self, consumer: Actor) -> Optional[ActionOrHandler]:
@@ -40,6 +42,8 @@ class Consumable(BaseComponent):
 
 
 class HealingConsumable(Consumable):
+    __slots__ = ('amount',)
+
     def __init__(self, amount: int):
         self.amount = amount
 
@@ -58,22 +62,20 @@ class HealingConsumable(Consumable):
 
 
 class LightningDamageConsumable(Consumable):
+    __slots__ = ('damage', 'max_range')
+
     def __init__(self, damage: int, maximum_range: int):
         self.damage = damage
         self.max_range = maximum_range
 
     def activate(self, action: actions.ItemAction) -> None:
         consumer = action.entity
-        target = None
-        closest_distance = self.max_range + 1.0
+        game_map = self.engine.game_map
+        store = game_map.actor_store
 
-        for actor in self.engine.game_map.actors:
-            if actor is not consumer and self.parent.gamemap.visible[actor.x, actor.y]:
-                distance = consumer.distance(actor.x, actor.y)
-
-                if distance < closest_distance:
-                    target = actor
-                    closest_distance = distance
+        candidates = store.in_mask(store.living_ids(), game_map.visible)
+        candidates = candidates[candidates != consumer.store_id]
+        target = store.nearest(candidates, consumer.x, consumer.y, self.max_range + 1.0)
 
         if target:
             self.engine.message_log.add_message(
@@ -87,6 +89,8 @@ class LightningDamageConsumable(Consumable):
 
 
 class ConfusionConsumable(Consumable):
+    __slots__ = ('number_of_turns',)
+
     def __init__(self, number_of_turns: int):
         self.number_of_turns = number_of_turns
 
@@ -119,6 +123,8 @@ class ConfusionConsumable(Consumable):
 
 
 class FireBallDamageConsumable(Consumable):
+    __slots__ = ('damage', 'radius')
+
     def __init__(self, damage: int, radius: int):
         self.damage = damage
         self.radius = radius
@@ -140,15 +146,15 @@ class FireBallDamageConsumable(Consumable):
         if not self.engine.game_map.visible[target_xy]:
             raise Impossible('You cannot target an area you cannot see.')
 
-        targets_hit = False
-        for action in self.engine.game_map.actors:
-            if action.distance(*target_xy) <= self.radius:
-                self.engine.message_log.add_message(
-                    f'The {action.name.lower()} is caught in the fireball, and takes {self.damage} DMG.',
-                )
-                action.fighter.take_damage(self.damage)
-                targets_hit = True
-
-        if not targets_hit:
+        store = self.engine.game_map.actor_store
+        targets = store.in_radius(store.living_ids(), *target_xy, self.radius)
+        if not len(targets):
             raise Impossible('There are no targets in that area')
+
+        for actor in store.get(targets):
+            self.engine.message_log.add_message(
+                f'The {actor.name.lower()} is caught in the fireball, and takes {self.damage} DMG.',
+            )
+        for actor in store.damage(targets, self.damage):
+            actor.fighter.die()
         self.consume()
\ No newline at end of file
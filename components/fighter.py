@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from components.base_components import BaseComponent
 
-from typing import TYPE_CHECKING
+from typing import Optional, TYPE_CHECKING
 
 import color
 from render_order import RenderOrder
@@ -10,23 +10,57 @@ from render_order import RenderOrder
 if TYPE_CHECKING:
     from entity import Actor
 
+class _StoreColumn:
+    """A `Fighter` stat, read from the `ActorStore` column `name` while the actor is on a map.
+
+    It is kept in the `_<name>` slot of the `Fighter` otherwise.
+    """
+    def __init__(self, name: str):
+        self.name = name
+        self.slot = f'_{name}'
+
+    def __get__(self, fighter: Optional[Fighter], owner: type = None):
+        if fighter is None:
+            return self
+        actor = fighter.parent
+        if actor.store_id is None:
+            return getattr(fighter, self.slot)
+        return getattr(actor.parent.actor_store, self.name).item(actor.store_id)
+
+    def __set__(self, fighter: Fighter, value: int) -> None:
+        actor = fighter.parent
+        if actor.store_id is None:
+            setattr(fighter, self.slot, value)
+        else:
+            getattr(actor.parent.actor_store, self.name)[actor.store_id] = value
+
+
 class Fighter(BaseComponent):
+    # The stats are kept here while the actor is off the map, and in the `ActorStore` of its map otherwise.
+    __slots__ = ('_max_hp', '_hp', '_base_def', '_base_pow')
+
     parent: Actor
 
+    max_hp = _StoreColumn('max_hp')
+    base_def = _StoreColumn('base_def')
+    base_pow = _StoreColumn('base_pow')
+    _stored_hp = _StoreColumn('hp')
+
     def __init__(self, hp: int, base_def: int, base_pow: int):
-        self.max_hp = hp
+        self._max_hp = hp
         self._hp = hp
-        self.base_def = base_def
-        self.base_pow = base_pow
+        self._base_def = base_def
+        self._base_pow = base_pow
 
     @property
     def hp(self) -> int:
-        return self._hp
+        return self._stored_hp
 
     @hp.setter
     def hp(self, value: int) -> None:
-        self._hp = max(0, min(value, self.max_hp))
-        if self._hp == 0 and self.parent.ai:
+        value = max(0, min(value, self.max_hp))
+        self._stored_hp = value
+        if value == 0 and self.parent.ai:
             self.die()
 
     @property
@@ -80,8 +114,10 @@ class Fighter(BaseComponent):
 
         self.parent.char = '²'
         self.parent.color = (191, 0, 0)
-        self.parent.blocks_movement = False
+        self.gamemap.set_blocks_movement(self.parent, False)
         self.parent.ai = None
+        self.gamemap.actor_store.mark_dead(self.parent)
+        self.gamemap.scheduler.remove(self.parent)
         self.parent.render_order = RenderOrder.CORPSE
         self.parent.name = f'remains of {self.parent.name.lower()}'
 
@@ -9,6 +9,8 @@ if TYPE_CHECKING:
 
 
 class Inventory(BaseComponent):
+    __slots__ = ('capacity', 'items')
+
     parent: Actor
 
     def __init__(self, capacity: int):
@@ -1,15 +1,30 @@
 # Screen data
 SCREEN_WIDTH = 80
 SCREEN_HEIGHT = 50
+VIEWPORT_WIDTH = 80  # Part of the screen showing the map, above the interface
+VIEWPORT_HEIGHT = 43
+FPS_CAP = 30  # Most frames drawn per second, the screen is only redrawn when something changed
 
 # Map data
 MAP_WIDTH = 80
 MAP_HEIGHT = 43
+CHUNKED_MAP_MIN_AREA = 1024 * 1024  # Maps with at least this many tiles only allocate the chunks of tiles they use
 
 
+# Simulation
+ACTIVITY_RADIUS = 12  # Monsters farther than this from the player, and outside of their room, can fall asleep
+NOISE_RADIUS = 10  # Distance at which a fight wakes up sleeping monsters
+FLOW_FIELD_RADIUS = 40  # Enemies chasing the player path within this distance from them
+
 # Room data
 ROOM_MAX_SIZE = 10
 ROOM_MIN_SIZE = 6
 ROOM_MAX_ROOMS = 30
 ROOM_MAX_MONSTERS_PER_ROOM = 2
-ROOM_MAX_ITEMS_PER_ROOM = 2
\ No newline at end of file
+ROOM_MAX_ITEMS_PER_ROOM = 2
+
+# Saving
+SAVE_FILENAME = 'savegame.sav'
+MESSAGE_ARCHIVE_FILENAME = 'savegame.log'  # Messages too old to be kept in memory
+LAYER_DIRECTORY = 'savegame.floors'  # Memory-mapped tile and exploration layers of the visited floors
+AUTOSAVE_INTERVAL = 50  # Turns between autosaves
@@ -1,17 +1,18 @@
 from __future__ import annotations
 
-import lzma
-import pickle
-from typing import TYPE_CHECKING
-
+import os
+from typing import Optional, Tuple, TYPE_CHECKING
 
+import numpy as np
 from tcod.console import Console
-from tcod.map import compute_fov
-from tcod import FOV_DIAMOND
+import tcod.path
 
-import exceptions
+from camera import Camera
 from message_log import MessageLog
+import consts
 import render_functions
+import savefile
+import scheduler
 
 if TYPE_CHECKING:
     from entity import Actor
@@ -24,39 +25,80 @@ class Engine:
     def __init__(
         self,
         player: Actor,
+        *,
+        message_archive: Optional[str] = None,
     ):
-        self.message_log = MessageLog()
+        self.message_log = MessageLog(archive_filename=message_archive)
         self.mouse_location = (0, 0)
         self.player = player
+        self.turn = 0
+        self._flow_field: Optional[np.ndarray] = None
+
+    @property
+    def flow_field(self) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """Return a distance map rooted at the player, shared by every enemy during the current turn.
+
+        The map is computed on first use in a turn, so turns where nobody chases the player don't pay for it.
+        """
+        if self._flow_field is None:
+            self._flow_field = self.compute_flow_field()
+        return self._flow_field
+
+    def compute_flow_field(self) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """Compute the Dijkstra distance from the player to every tile near them.
+
+        Only the tiles within `consts.FLOW_FIELD_RADIUS` of the player are covered, whatever the size of the map.
+        Returns the distances and the map position of their first element.
+        Enemies walk towards the player by descending this map.
+        """
+        radius = consts.FLOW_FIELD_RADIUS
+        game_map = self.game_map
+        x1, y1 = max(0, self.player.x - radius), max(0, self.player.y - radius)
+        x2, y2 = min(game_map.width, self.player.x + radius + 1), min(game_map.height, self.player.y + radius + 1)
+        cost = game_map.movement_cost[x1:x2, y1:y2]
+        distance = tcod.path.maxarray(cost.shape, dtype=np.int32, order='F')
+        distance[self.player.x - x1, self.player.y - y1] = 0
+        tcod.path.dijkstra2d(distance, cost, 2, 3, out=distance)
+        return distance, (x1, y1)
 
     def handle_enemy_turns(self) -> None:
-        for entity in set(self.game_map.actors) - {self.player}:
-            if entity.ai:
-                try:
-                    entity.ai.perform()
-                except exceptions.Impossible:
-                    pass
+        """Let the time of the player's action pass, every actor due within that time acts.
+
+        Actors far from the player are asleep and skipped, until the player comes near them.
+        """
+        self._flow_field = None  # The player has acted, so last turn's distances are stale.
+        self.game_map.update_activity(self.player.x, self.player.y, consts.ACTIVITY_RADIUS)
+        self.game_map.scheduler.advance(scheduler.action_time(self.player))
+
+    def end_turn(self) -> None:
+        """Finish a turn after the player performed a valid action."""
+        self.handle_enemy_turns()
+        self.update_fov()
+        self.turn += 1
 
     def save_as(self, filename: str) -> None:
         """Save this Engine instance as a compressed file."""
-        save_data = lzma.compress(pickle.dumps(self))
-        with open(filename, 'wb') as f:
-            f.write(save_data)
-
-    def update_fov(self):
-        """Recompute the visible area based on the player's POV."""
-        self.game_map.visible[:] = compute_fov(
-            self.game_map.tiles['transparent'],
-            (self.player.x, self.player.y),
-            radius=8,
-            algorithm=FOV_DIAMOND
+        savefile.write_file(filename, savefile.dumps(self, os.path.dirname(filename)))
+
+    def update_fov(self, *, force: bool = False):
+        """Recompute the visible area based on the player's POV, if the player moved or the map changed."""
+        self.game_map.update_fov(self.player.x, self.player.y, radius=8, force=force)
+
+
+    @property
+    def camera(self) -> Camera:
+        """Return the view of the map drawn on the screen, which follows the player."""
+        return Camera.following(
+            self.player.x,
+            self.player.y,
+            consts.VIEWPORT_WIDTH,
+            consts.VIEWPORT_HEIGHT,
+            self.game_map.width,
+            self.game_map.height,
         )
-        # If a tile is visible it should be added to `explored`
-        self.game_map.explored |= self.game_map.visible  # Sets the explored array to include everything in the visible array
-
 
     def render(self, console: Console) -> None:
-        self.game_map.render(console)
+        self.game_map.render(console, self.camera)
 
         self.message_log.render(console, x=21, y=45, width=40, height=5)
 
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-import copy
 import math
-from typing import Optional, Tuple, Type, TypeVar, TYPE_CHECKING, Union
+from typing import Optional, Tuple, Type, TYPE_CHECKING, Union
 
 from render_order import RenderOrder
+from scheduler import NORMAL_SPEED
 
 
 if TYPE_CHECKING:
@@ -17,12 +17,12 @@ if TYPE_CHECKING:
     from components.consumable import Consumable
     from components.equippable import Equippable
 
-T = TypeVar('T', bound='Entity')
-
 
 
 class Entity:
     """Generic object."""
+    __slots__ = ('x', 'y', 'char', 'color', 'name', 'blocks_movement', 'render_order', 'parent')
+
     parent: Union[GameMap, Inventory]
 
     def __init__(
@@ -46,42 +46,39 @@ class Entity:
         if parent:
             # If `gamemap` isn't provided now then it will be set later
             self.parent = parent
-            parent.entities.add(self)
+            parent.add_entity(self)
 
     @property
     def gamemap(self):
         return self.parent.gamemap
 
-    def spawn(self: T, gamemap: GameMap, x: int, y: int):
-        """Spawn a copy of this instance at a given location."""
-        clone = copy.deepcopy(self)
-        clone.x = x
-        clone.y = y
-        clone.parent = gamemap
-        gamemap.entities.add(clone)
-        return clone
-
     def place(self, x: int, y: int, gamemap: Optional[GameMap] = None):
         """Place the entity at a new location. Handles moving across `GameMap`s"""
-        self.x = x
-        self.y = y
+        on_map = hasattr(self, "parent") and self.parent is self.gamemap  # Parent is possibly uninitialized.
         if gamemap:
-            if hasattr(self, "parent"):  # Possibly uninitialized.
-                if self.parent is self.gamemap:
-                    self.gamemap.entities.remove(self)
+            if on_map:
+                self.gamemap.remove_entity(self)
+            self.x = x
+            self.y = y
             self.parent = gamemap
-            gamemap.entities.add(self)
+            gamemap.add_entity(self)
+        elif on_map:
+            self.gamemap.move_entity(self, x, y)
+        else:
+            self.x = x
+            self.y = y
 
     def distance(self, x: int, y: int) -> float:
         """Return the distance between the entity and the given (x, y) coordiante."""
         return math.sqrt((x - self.x) ** 2 + (y - self.y) ** 2)
 
     def move(self, dest_x: int, dest_y: int) -> None:
-        self.x += dest_x
-        self.y += dest_y
+        self.gamemap.move_entity(self, self.x + dest_x, self.y + dest_y)
 
 
 class Actor(Entity):
+    __slots__ = ('ai', 'equipment', 'fighter', 'inventory', 'level', 'speed', 'store_id')
+
     def __init__(
             self,
             *,
@@ -96,6 +93,7 @@ class Actor(Entity):
             fighter: Fighter,
             inventory: Inventory,
             level: Level,
+            speed: int = NORMAL_SPEED,
     ):
         super().__init__(
             x=x,
@@ -107,6 +105,10 @@ class Actor(Entity):
             render_order=RenderOrder.ACTOR,
         )
 
+        # Row of this actor in the `ActorStore` of its map, None while it isn't on a map.
+        self.store_id: Optional[int] = None
+        self.speed = speed  # Relative to `NORMAL_SPEED`, see `scheduler`.
+
         self.ai: Optional[BaseAI] = ai_cls(self)
 
         self.equipment = equipment
@@ -129,6 +131,8 @@ class Actor(Entity):
 
 
 class Item(Entity):
+    __slots__ = ('consumable', 'equippable')
+
     def __init__(
             self,
             *,
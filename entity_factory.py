@@ -1,3 +1,5 @@
+from functools import partial
+
 from components.ai import HostileEnemy
 from components import consumable, equippable
 from components.equipment import Equipment
@@ -5,106 +7,108 @@ from components.inventory import Inventory
 from components.fighter import Fighter
 from components.level import Level
 
-from entity import Actor, Item
+from entity_templates import ActorTemplate, ItemTemplate
 
 
-player = Actor(
+player = ActorTemplate(
     char='☺',
     color=(255, 255, 255),
     name='Player',
     ai_cls=HostileEnemy,
-    equipment=Equipment(),
-    fighter=Fighter(
+    equipment=Equipment,
+    fighter=partial(
+        Fighter,
         hp=30,
         base_def=2,
         base_pow=5,
     ),
-    inventory=Inventory(capacity=26),
-    level=Level(level_up_base=200),
+    inventory=partial(Inventory, capacity=26),
+    level=partial(Level, level_up_base=200),
 )
 
-orc = Actor(
+orc = ActorTemplate(
     char='☻',
     color=(63, 127, 63),
     name='Orc',
     ai_cls=HostileEnemy,
-    equipment=Equipment(),
-    fighter=Fighter(
+    equipment=Equipment,
+    fighter=partial(
+        Fighter,
         hp=10,
         base_def=0,
         base_pow=3,
     ),
-    inventory=Inventory(capacity=0),
-    level=Level(xp_given=35),
+    inventory=partial(Inventory, capacity=0),
+    level=partial(Level, xp_given=35),
 )
 
-troll = Actor(
+troll = ActorTemplate(
     char='☻',
     color=(48, 138, 135),
     name='Troll',
     ai_cls=HostileEnemy,
-    equipment=Equipment(),
-    fighter=Fighter(
+    equipment=Equipment,
+    fighter=partial(
+        Fighter,
         hp=16,
         base_def=1,
         base_pow=4,
     ),
-    inventory=Inventory(capacity=0),
-    level=Level(xp_given=100),
+    inventory=partial(Inventory, capacity=0),
+    level=partial(Level, xp_given=100),
 )
 
-health_potion = Item(
+health_potion = ItemTemplate(
     char='¡',
     color=(205, 13, 58),
     name='Health Potion',
-    consumable=consumable.HealingConsumable(amount=4),
+    consumable=partial(consumable.HealingConsumable, amount=4),
 )
 
-lightning_scroll = Item(
+lightning_scroll = ItemTemplate(
     char='º',
     color=(188, 209, 50),
     name='Lightning Scroll',
-    consumable=consumable.LightningDamageConsumable(damage=20, maximum_range=5),
+    consumable=partial(consumable.LightningDamageConsumable, damage=20, maximum_range=5),
 )
 
-confusion_scroll = Item(
+confusion_scroll = ItemTemplate(
     char='º',
     color=(207, 63, 255),
     name='Confusion Scroll',
-    consumable=consumable.ConfusionConsumable(number_of_turns=10)
+    consumable=partial(consumable.ConfusionConsumable, number_of_turns=10)
 )
-fireball_scroll = Item(
+fireball_scroll = ItemTemplate(
     char='º',
     color=(205, 13, 58),
     name='Fireball Scroll',
-    consumable=consumable.FireBallDamageConsumable(damage=12, radius=3)
+    consumable=partial(consumable.FireBallDamageConsumable, damage=12, radius=3)
 )
 
-dagger = Item(
+dagger = ItemTemplate(
     char='√',
     color=(155, 155, 155),
     name='Dagger',
-    equippable=equippable.Dagger()
+    equippable=equippable.Dagger
 )
 
-sword = Item(
+sword = ItemTemplate(
     char='√',
     color=(192, 192, 192),
     name='Sword',
-    equippable=equippable.Sword()
+    equippable=equippable.Sword
 )
 
-leather_armor = Item(
+leather_armor = ItemTemplate(
     char='[',
     color=(155,155,155),
     name='Hide armor',
-    equippable=equippable.LeatherArmor()
+    equippable=equippable.LeatherArmor
 )
 
-chainmail_armor = Item(
+chainmail_armor = ItemTemplate(
     char=']',
     color=(155,155,155),
     name='Chainmail Armor',
-    equippable=equippable.ChainMailArmor()
+    equippable=equippable.ChainMailArmor
 )
-
@@ -0,0 +1,101 @@
+"""Templates for spawning entities.
+
+A template keeps the immutable parts of an entity (its name, glyph and color), which are shared by every entity built
+from it, and a factory for each component. Building an entity calls the constructors directly, instead of deep
+copying a prototype instance and all of its components.
+"""
+from __future__ import annotations
+
+from typing import Callable, Generic, Optional, Tuple, Type, TypeVar, TYPE_CHECKING
+
+from entity import Actor, Entity, Item
+from scheduler import NORMAL_SPEED
+
+if TYPE_CHECKING:
+    from components.ai import BaseAI
+    from components.consumable import Consumable
+    from components.equipment import Equipment
+    from components.equippable import Equippable
+    from components.fighter import Fighter
+    from components.inventory import Inventory
+    from components.level import Level
+    from game_map import GameMap
+
+T = TypeVar('T', bound=Entity)
+
+
+class EntityTemplate(Generic[T]):
+    def __init__(self, *, char: str, color: Tuple[int, int, int], name: str):
+        self.char = char
+        self.color = color
+        self.name = name
+
+    def build(self) -> T:
+        """Return a new entity from this template, not placed on any map."""
+        raise NotImplementedError()
+
+    def spawn(self, gamemap: GameMap, x: int, y: int) -> T:
+        """Spawn a new entity from this template at a given location."""
+        entity = self.build()
+        entity.place(x, y, gamemap)
+        return entity
+
+
+class ActorTemplate(EntityTemplate[Actor]):
+    def __init__(
+            self,
+            *,
+            char: str,
+            color: Tuple[int, int, int],
+            name: str,
+            ai_cls: Type[BaseAI],
+            equipment: Callable[[], Equipment],
+            fighter: Callable[[], Fighter],
+            inventory: Callable[[], Inventory],
+            level: Callable[[], Level],
+            speed: int = NORMAL_SPEED,
+    ):
+        super().__init__(char=char, color=color, name=name)
+        self.ai_cls = ai_cls
+        self.speed = speed
+        self.equipment = equipment
+        self.fighter = fighter
+        self.inventory = inventory
+        self.level = level
+
+    def build(self) -> Actor:
+        return Actor(
+            char=self.char,
+            color=self.color,
+            name=self.name,
+            ai_cls=self.ai_cls,
+            equipment=self.equipment(),
+            fighter=self.fighter(),
+            inventory=self.inventory(),
+            level=self.level(),
+            speed=self.speed,
+        )
+
+
+class ItemTemplate(EntityTemplate[Item]):
+    def __init__(
+            self,
+            *,
+            char: str,
+            color: Tuple[int, int, int],
+            name: str,
+            consumable: Optional[Callable[[], Consumable]] = None,
+            equippable: Optional[Callable[[], Equippable]] = None,
+    ):
+        super().__init__(char=char, color=color, name=name)
+        self.consumable = consumable
+        self.equippable = equippable
+
+    def build(self) -> Item:
+        return Item(
+            char=self.char,
+            color=self.color,
+            name=self.name,
+            consumable=self.consumable() if self.consumable else None,
+            equippable=self.equippable() if self.equippable else None,
+        )
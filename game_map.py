@@ -1,16 +1,30 @@
 from __future__ import annotations
 
-from typing import Iterable, Iterator, Optional, TYPE_CHECKING
+from concurrent.futures import Future, ProcessPoolExecutor
+import multiprocessing
+import os
+import random
+import secrets
+import traceback
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, TYPE_CHECKING
 
 import numpy as np
+from tcod import FOV_DIAMOND
 from tcod.console import Console
+from tcod.map import compute_fov
 
+from actor_store import ActorStore, radius_mask
+from camera import Camera
+from chunked_array import ChunkedArray
 from entity import Actor, Item
+from scheduler import Scheduler
+import consts
 import tile_types
 
 if TYPE_CHECKING:
     from engine import Engine
     from entity import Entity
+    from procgen import DungeonLayout
 
 class GameMap:
     def __init__(
@@ -19,32 +33,99 @@ class GameMap:
         width: int,
         height: int,
         entities: Iterable[Entity] = (),
+        *,
+        chunked: Optional[bool] = None,
     ):
         self.engine = engine
         self.width = width
         self.height = height
 
-        self.entities = set(entities)
+        self.entities: Set[Entity] = set()
+
+        # Spatial index of the entities on this map.
+        # `_entity_buckets` maps an `(x, y)` position to the entities standing on it, for O(1) point lookups.
+        # `_occupancy` counts the entities on each tile, so region queries can find occupied tiles with NumPy.
+        self._entity_buckets: Dict[Tuple[int, int], List[Entity]] = {}
+        self._occupancy = np.zeros((width, height), dtype=np.uint16, order='F')
+
+        # Positions and fighter stats of the actors on this map, as arrays.
+        self.actor_store = ActorStore()
+        # Turn order of the living actors on this map, other than the player.
+        # Actors missing from it are asleep, see `update_activity`.
+        self.scheduler = Scheduler()
+
+        # Rooms kept from the dungeon generator, and the room number of each tile, 0 outside of rooms.
+        self.rooms: List[Tuple[int, int, int, int]] = []
+        self._room_numbers = np.zeros((width, height), dtype=np.uint16, order='F')
+
+        # Where the player was when the activity zone was last updated, and its radius.
+        self._activity_origin: Optional[Tuple[int, int]] = None
+        self._activity_radius = 0
 
         # Tiles
-        self.tiles = np.full((width, height), fill_value=tile_types.wall, order='F')
+        # Large maps keep their tiles in a `ChunkedArray`, where the chunks left as walls take no memory,
+        # by default once they reach `consts.CHUNKED_MAP_MIN_AREA` tiles.
+        if chunked is None:
+            chunked = width * height >= consts.CHUNKED_MAP_MIN_AREA
+        if chunked:
+            self.tiles = ChunkedArray((width, height), fill_value=tile_types.wall)
+        else:
+            self.tiles = np.full((width, height), fill_value=tile_types.wall, order='F')
+
+        # Pathfinding cost of each tile, kept up to date as tiles change and entities move.
+        # Unwalkable tiles cost 0, and tiles with a blocking entity cost more so enemies walk around each other.
+        self._blocking = np.zeros((width, height), dtype=np.uint8, order='F')
+        self.movement_cost = np.zeros((width, height), dtype=np.int8, order='F')
+
+        for entity in entities:
+            self.add_entity(entity)
 
         self.visible = np.full((width, height), fill_value=False, order='F')
         self.explored = np.full((width, height), fill_value=False, order='F')
 
+        # `visible` is only recomputed when the point of view or the transparency of the tiles changed.
+        # It can only be True within the window of the last computation, which is cleared before the next one.
+        self._transparency_version = 0
+        self._fov_key: Optional[Tuple[int, int, int, int]] = None
+        self._fov_window: Optional[Tuple[slice, slice]] = None
+
         self.downstairs_location = (0, 0)
 
+        # The map layer as drawn: `light` tiles where visible, `dark` tiles where explored, `SHROUD` elsewhere.
+        # It only covers `_rgb_window`, the region of the map in view of the camera, so its size doesn't depend on
+        # the size of the map. It is only recomposed where `mark_dirty` was called since the last frame,
+        # or entirely when the camera moved, instead of every frame.
+        # It is allocated by the first `render`, with the memory layout of the console.
+        self._rgb: Optional[np.ndarray] = None
+        self._rgb_window: Optional[Tuple[slice, slice]] = None
+        self._dirty: Optional[Tuple[int, int, int, int]] = None
+        self.mark_dirty()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state['_rgb']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._rgb = None
+        self._rgb_window = None
+        self._dirty = None
+        self.mark_dirty()
+        # Arrays loaded from a save file can be read-only views of its data.
+        # The layers that change every turn get their own memory, `tiles` is only copied if it is ever modified.
+        for name in ('visible', 'explored', 'movement_cost', '_blocking', '_occupancy'):
+            array = getattr(self, name)
+            if not array.flags.writeable:
+                setattr(self, name, array.copy(order='F'))
+
     @property
     def gamemap(self) -> GameMap:
         return self
 
     @property
     def actors(self) -> Iterator[Actor]:
-        yield from (
-            entity
-            for entity in self.entities
-            if isinstance(entity, Actor) and entity.is_alive
-        )
+        yield from self.actor_store.get(self.actor_store.living_ids())
 
     @property
     def items(self) -> Iterator[Item]:
@@ -54,49 +135,332 @@ class GameMap:
             if isinstance(entity, Item)
         )
 
-    def get_blocking_entity_at_location(self, location_x: int, location_y: int) -> Optional[Entity]:
-        for entity in self.entities:
+    def add_entity(self, entity: Entity) -> None:
+        """Add `entity` to this map and index it at its current position."""
+        self.entities.add(entity)
+        self._index(entity)
+        if isinstance(entity, Actor):
+            self.actor_store.add(entity)
+            if entity.is_alive and entity is not self.engine.player:
+                self.scheduler.add(entity)
+
+    def remove_entity(self, entity: Entity) -> None:
+        """Remove `entity` from this map and its position index."""
+        self.entities.remove(entity)
+        self._unindex(entity)
+        if isinstance(entity, Actor):
+            self.actor_store.remove(entity)
+            self.scheduler.remove(entity)
+
+    def move_entity(self, entity: Entity, x: int, y: int) -> None:
+        """Move an entity already on this map to `(x, y)`, keeping the position index up to date."""
+        self._unindex(entity)
+        entity.x = x
+        entity.y = y
+        self._index(entity)
+        if isinstance(entity, Actor):
+            self.actor_store.move(entity)
+
+    def set_blocks_movement(self, entity: Entity, blocks_movement: bool) -> None:
+        """Change whether an entity on this map blocks movement, updating the movement cost under it."""
+        if entity.blocks_movement == blocks_movement:
+            return
+        self._unindex(entity)
+        entity.blocks_movement = blocks_movement
+        self._index(entity)
+
+    def set_tiles(self, index, tile: np.ndarray) -> None:
+        """Assign `tile` to `self.tiles[index]`, updating the movement cost of the changed tiles."""
+        if isinstance(self.tiles, np.ndarray) and not self.tiles.flags.writeable:
+            self.tiles = self.tiles.copy(order='F')
+        self.tiles[index] = tile
+        self.movement_cost[index] = np.where(tile['walkable'], 1 + 10 * self._blocking[index], 0)
+        self._transparency_version += 1
+        self.mark_dirty()
+
+    def store_layers(self, directory: str, prefix: str) -> None:
+        """Move `tiles` and `explored` into memory-mapped `.npy` files in `directory`, named after `prefix`.
+
+        The layers are then paged in and out by the OS as they are used, and saves only reference the files,
+        see `savefile`. Changes are written to the files as the game goes, not just when it is saved.
+        Tiles kept in a `ChunkedArray` are already small, and stay in memory.
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name in ('tiles', 'explored'):
+            array = getattr(self, name)
+            if not isinstance(array, np.ndarray):
+                continue
+            layer = np.lib.format.open_memmap(
+                os.path.join(directory, f'{prefix}.{name}.npy'),
+                mode='w+',
+                dtype=array.dtype,
+                shape=array.shape,
+                fortran_order=True,
+            )
+            layer[...] = array
+            setattr(self, name, layer)
+
+    def set_rooms(self, rooms: List[Tuple[int, int, int, int]]) -> None:
+        """Record the inner area of the rooms of this map, as `(x1, y1, x2, y2)` with `x2` and `y2` exclusive."""
+        self.rooms = list(rooms)
+        if len(self.rooms) > np.iinfo(self._room_numbers.dtype).max:
+            self._room_numbers = np.zeros((self.width, self.height), dtype=np.int32, order='F')
+        self._room_numbers[...] = 0
+        for number, (x1, y1, x2, y2) in enumerate(self.rooms, start=1):
+            self._room_numbers[x1:x2, y1:y2] = number
+
+    def room_at(self, x: int, y: int) -> Optional[Tuple[int, int, int, int]]:
+        """Return the room containing `(x, y)`, or None."""
+        number = self._room_numbers[x, y]
+        return self.rooms[number - 1] if number else None
+
+    def update_activity(self, x: int, y: int, radius: int) -> None:
+        """Move the activity zone to the player standing at `(x, y)`, waking up the actors within it.
+
+        The zone is made of the tiles within `radius` of the player, by Chebyshev distance, and the room they are in.
+        Actors outside of it may `sleep`, and leave the turn order until they are woken up.
+        The radius must be larger than the player's sight, so every actor the player can see is awake.
+        """
+        if self._activity_origin == (x, y) and self._activity_radius == radius:
+            return
+        self._activity_origin = x, y
+        self._activity_radius = radius
+        self.wake_in_rect(x - radius, y - radius, x + radius + 1, y + radius + 1)
+        room = self.room_at(x, y)
+        if room:
+            self.wake_in_rect(*room)
+
+    def in_activity_zone(self, x: int, y: int) -> bool:
+        """Return True if `(x, y)` is within the activity zone, where actors stay awake."""
+        if self._activity_origin is None:
+            return True
+        origin_x, origin_y = self._activity_origin
+        if max(abs(x - origin_x), abs(y - origin_y)) <= self._activity_radius:
+            return True
+        number = self._room_numbers[x, y]
+        return bool(number) and number == self._room_numbers[origin_x, origin_y]
+
+    def sleep(self, actor: Actor) -> None:
+        """Take `actor` out of the turn order until it is woken up."""
+        self.scheduler.remove(actor)
+
+    def wake_in_rect(self, x1: int, y1: int, x2: int, y2: int) -> None:
+        """Put the sleeping actors within `x1 <= x < x2` and `y1 <= y < y2` back in the turn order."""
+        self._wake(self.entities_in_rect(x1, y1, x2, y2))
+
+    def make_noise(self, x: int, y: int, radius: int) -> None:
+        """Wake up the sleeping actors within `radius` of a noise at `(x, y)`."""
+        self._wake(self.entities_in_radius(x, y, radius))
+
+    def _wake(self, entities: Iterable[Entity]) -> None:
+        for entity in entities:
             if (
-                entity.blocks_movement
-                and entity.x == location_x
-                and entity.y == location_y
+                isinstance(entity, Actor)
+                and entity.is_alive
+                and entity not in self.scheduler
+                and entity is not self.engine.player
             ):
+                self.scheduler.add(entity)
+
+    def update_fov(self, x: int, y: int, radius: int, *, force: bool = False) -> None:
+        """Recompute `visible` from `(x, y)`, and add it to `explored`.
+
+        Nothing is done if neither the point of view nor the tiles changed since the last call, unless `force` is True.
+        Only the square of `radius` tiles around `(x, y)` is computed, which is all a FOV of that radius can reach.
+        """
+        key = x, y, radius, self._transparency_version
+        if key == self._fov_key and not force:
+            return
+        self._fov_key = key
+
+        if self._fov_window:
+            self.visible[self._fov_window] = False
+            self._mark_dirty_window(self._fov_window)
+
+        x1, y1 = max(0, x - radius), max(0, y - radius)
+        x2, y2 = min(self.width, x + radius + 1), min(self.height, y + radius + 1)
+        window = np.s_[x1:x2, y1:y2]
+        self.visible[window] = compute_fov(
+            self.tiles['transparent'][window],
+            (x - x1, y - y1),
+            radius=radius,
+            algorithm=FOV_DIAMOND,
+        )
+        self.explored[window] |= self.visible[window]
+        self._fov_window = window
+        self._mark_dirty_window(window)
+
+    def _mark_dirty_window(self, window: Tuple[slice, slice]) -> None:
+        x_slice, y_slice = window
+        self.mark_dirty(x_slice.start, y_slice.start, x_slice.stop, y_slice.stop)
+
+    def mark_dirty(self, x1: int = 0, y1: int = 0, x2: Optional[int] = None, y2: Optional[int] = None) -> None:
+        """Note that the tiles, `visible` or `explored` changed within `x1 <= x < x2` and `y1 <= y < y2`.
+
+        Without arguments the whole map is marked.
+        """
+        x2 = self.width if x2 is None else x2
+        y2 = self.height if y2 is None else y2
+        if self._dirty:
+            old_x1, old_y1, old_x2, old_y2 = self._dirty
+            x1, y1, x2, y2 = min(x1, old_x1), min(y1, old_y1), max(x2, old_x2), max(y2, old_y2)
+        self._dirty = max(0, x1), max(0, y1), min(self.width, x2), min(self.height, y2)
+
+    def _compose(self) -> None:
+        """Recompose the dirty region of the map layer that is in view."""
+        x1, y1, x2, y2 = self._dirty
+        self._dirty = None
+        x_window, y_window = self._rgb_window
+        x1, y1 = max(x1, x_window.start), max(y1, y_window.start)
+        x2, y2 = min(x2, x_window.stop), min(y2, y_window.stop)
+        if x1 >= x2 or y1 >= y2:
+            return
+        region = np.s_[x1:x2, y1:y2]
+        rgb = self._rgb[x1 - x_window.start:x2 - x_window.start, y1 - y_window.start:y2 - y_window.start]
+        rgb[...] = tile_types.SHROUD
+        np.copyto(rgb, self.tiles['dark'][region], where=self.explored[region])
+        np.copyto(rgb, self.tiles['light'][region], where=self.visible[region])
+
+    def _index(self, entity: Entity) -> None:
+        location = entity.x, entity.y
+        self._entity_buckets.setdefault(location, []).append(entity)
+        self._occupancy[location] += 1
+        if entity.blocks_movement:
+            self._blocking[location] += 1
+            if self.movement_cost[location]:
+                self.movement_cost[location] += 10
+
+    def _unindex(self, entity: Entity) -> None:
+        location = entity.x, entity.y
+        bucket = self._entity_buckets[location]
+        bucket.remove(entity)
+        if not bucket:
+            del self._entity_buckets[location]
+        self._occupancy[location] -= 1
+        if entity.blocks_movement:
+            self._blocking[location] -= 1
+            if self.movement_cost[location]:
+                self.movement_cost[location] -= 10
+
+    def entities_at(self, x: int, y: int) -> Tuple[Entity, ...]:
+        """Return the entities standing on `(x, y)`."""
+        return tuple(self._entity_buckets.get((x, y), ()))
+
+    def entities_in_rect(self, x1: int, y1: int, x2: int, y2: int) -> Iterator[Entity]:
+        """Yield the entities within `x1 <= x < x2` and `y1 <= y < y2`."""
+        x1, y1 = max(0, x1), max(0, y1)
+        x2, y2 = min(self.width, x2), min(self.height, y2)
+        if x1 >= x2 or y1 >= y2:
+            return
+
+        xs, ys = np.nonzero(self._occupancy[x1:x2, y1:y2])
+        for x, y in zip((xs + x1).tolist(), (ys + y1).tolist()):
+            yield from self._entity_buckets[x, y]
+
+    def entities_in_radius(self, x: int, y: int, radius: float) -> Iterator[Entity]:
+        """Yield the entities whose distance to `(x, y)` is at most `radius`, using the same metric as `Entity.distance`."""
+        mask = radius_mask(radius)
+        reach = int(radius)
+        x1, y1 = max(0, x - reach), max(0, y - reach)
+        x2, y2 = min(self.width, x + reach + 1), min(self.height, y + reach + 1)
+        if x1 >= x2 or y1 >= y2:
+            return
+
+        mask = mask[x1 - x + reach:x2 - x + reach, y1 - y + reach:y2 - y + reach]
+        xs, ys = np.nonzero((self._occupancy[x1:x2, y1:y2] > 0) & mask)
+        for cell_x, cell_y in zip((xs + x1).tolist(), (ys + y1).tolist()):
+            yield from self._entity_buckets[cell_x, cell_y]
+
+    def get_blocking_entity_at_location(self, location_x: int, location_y: int) -> Optional[Entity]:
+        for entity in self._entity_buckets.get((location_x, location_y), ()):
+            if entity.blocks_movement:
                 return entity
 
         return None
 
     def get_actor_at_location(self, x: int, y: int) -> Optional[Actor]:
-        for actor in self.actors:
-            if actor.x == x and actor.y == y:
-                return actor
+        for entity in self._entity_buckets.get((x, y), ()):
+            if isinstance(entity, Actor) and entity.is_alive:
+                return entity
         return None
 
     def in_bounds(self, x: int, y: int) -> bool:
         """Returns a bool based on if `x` and `y` is within bounds of the map."""
         return 0 <= x <= self.width and 0 <= y <= self.height
 
-    def render(self, console: Console) -> None:
-        """Using the `Console` class's `tiles_rgb` method, we can quickly render the entire map.
+    def render(self, console: Console, camera: Camera) -> None:
+        """Draw the part of the map in view of `camera`, using the `Console` class's `tiles_rgb` array.
 
         If a tile is in the `self.visible` array, then draw it with the `light` colors.
         If it isn't, but it's in the explored array, draw it with 'dark' colors.
-        Otherwise, draw it as `SHROUD`
+        Otherwise, draw it as `SHROUD`.
+        Only the tiles in view are composed and drawn, so the cost of a frame doesn't grow with the size of the map.
         """
-        console.tiles_rgb[0:self.width, 0:self.height] = np.select(
-            condlist=[self.visible, self.explored],
-            choicelist=[self.tiles['light'], self.tiles['dark']],
-            default=tile_types.SHROUD
-        )
+        window, screen = camera.clip(self.width, self.height)
+        target = console.tiles_rgb[screen]
+        if self._rgb is None or self._rgb.dtype != target.dtype or self._rgb.shape != target.shape:
+            self._rgb = np.empty(target.shape, dtype=target.dtype, order='F')
+            self._rgb_window = None
+        if self._rgb_window != window:
+            self._rgb_window = window
+            self._dirty = None
+            self._mark_dirty_window(window)
+        if self._dirty:
+            self._compose()
+        # Copying the fields of a structured array one by one is slow, copy the cells as raw bytes instead.
+        raw = np.dtype((np.void, target.dtype.itemsize))
+        target.view(raw)[...] = self._rgb.view(raw)
+
+        # Only the entity with the highest render order is seen on each tile, so there is no need to sort them all.
+        # The visible, occupied tiles are found with NumPy, then the Python work is limited to what can be seen.
+        # Flat indexes are much faster to find than `np.nonzero` on a 2D array.
+        visible = self.visible[window]
+        cells = np.flatnonzero(visible.ravel(order='F'))
+        cells = cells[self._occupancy[window].ravel(order='F')[cells] > 0]
+        if not len(cells):
+            return
+        ys, xs = np.divmod(cells, visible.shape[0])
+        x_window, y_window = window
+        chars = []
+        colors = []
+        for x, y in zip((xs + x_window.start).tolist(), (ys + y_window.start).tolist()):
+            bucket = self._entity_buckets[x, y]
+            entity = bucket[0] if len(bucket) == 1 else max(bucket, key=_render_order_value)
+            chars.append(ord(entity.char))
+            colors.append(entity.color)
+        x_screen, y_screen = screen
+        console.tiles_rgb['ch'][xs + x_screen.start, ys + y_screen.start] = chars
+        console.tiles_rgb['fg'][xs + x_screen.start, ys + y_screen.start] = colors
+
+
+def _render_order_value(entity: Entity) -> int:
+    return entity.render_order.value
+
 
-        entities_sorted_for_rendering = sorted(self.entities, key=lambda x: x.render_order.value)
+_pregeneration_executor: Optional[ProcessPoolExecutor] = None
 
-        for entity in entities_sorted_for_rendering:
-            if self.visible[entity.x, entity.y]:
-                console.print(x=entity.x, y=entity.y, string=entity.char, fg=entity.color)
+
+def _get_pregeneration_executor() -> ProcessPoolExecutor:
+    """Return the worker process used to generate floors in the background, starting it if needed."""
+    global _pregeneration_executor
+    if _pregeneration_executor is None:
+        # A fresh interpreter is used instead of a fork, so the worker doesn't inherit the window or event loop.
+        _pregeneration_executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+    return _pregeneration_executor
 
 
 class GameWorld:
-    """Holds the settings for the `GameMap`, and generates new maps when moving down the stairs."""
+    """Holds the settings for the `GameMap`, and generates new maps when moving down the stairs.
+
+    If `pregenerate` is True, the next floor is generated in a worker process as soon as a floor is entered,
+    so taking the stairs only has to build the map from the finished layout.
+
+    If `layer_directory` is set, the tile and exploration layers of every floor are stored in memory-mapped files
+    there, see `GameMap.store_layers`. The files of the floors left behind are kept.
+
+    All randomness is derived from `seed`: every floor and subsystem gets an independent stream,
+    so a floor comes out the same no matter which process generates it, or in which order.
+    """
     def __init__(
             self,
             *,
@@ -107,6 +471,9 @@ class GameWorld:
             room_min_size: int,
             room_max_size: int,
             current_floor: int = 0,
+            pregenerate: bool = True,
+            seed: Optional[int] = None,
+            layer_directory: Optional[str] = None,
     ):
         self.engine = engine
         self.map_width = map_width
@@ -115,17 +482,83 @@ class GameWorld:
         self.room_min_size = room_min_size
         self.room_max_size = room_max_size
         self.current_floor = current_floor
+        self.pregenerate = pregenerate
+        self.seed = seed if seed is not None else secrets.randbits(64)
+        self.layer_directory = layer_directory
 
-    def generate_floor(self) -> None:
-        from procgen import generate_dungeon
+        # Random streams of the current floor, by subsystem. They are saved with the game, so replays stay in sync.
+        self._streams: Dict[str, random.Random] = {}
 
-        self.current_floor += 1
+        # The floor number being generated in the background, and its pending result.
+        self._pregenerated: Optional[Tuple[int, Future]] = None
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state['_pregenerated'] = None  # A background generation can't be saved, it is restarted as needed.
+        return state
+
+    def rng_for(self, floor_number: int, subsystem: str) -> random.Random:
+        """Return a new random stream for a subsystem on a floor, derived only from the world seed."""
+        return random.Random(f'{self.seed}/{floor_number}/{subsystem}')
 
-        self.engine.game_map = generate_dungeon(
+    def rng(self, subsystem: str) -> random.Random:
+        """Return the random stream used by a subsystem on the current floor."""
+        stream = self._streams.get(subsystem)
+        if stream is None:
+            stream = self._streams[subsystem] = self.rng_for(self.current_floor, subsystem)
+        return stream
+
+    def layout_settings(self, floor_number: int) -> dict:
+        """Return the keyword arguments for `procgen.generate_layout` for the given floor."""
+        return dict(
+            map_width=self.map_width,
+            map_height=self.map_height,
             max_rooms=self.max_rooms,
             room_min_size=self.room_min_size,
             room_max_size=self.room_max_size,
-            map_width=self.map_width,
-            map_height=self.map_height,
-            engine=self.engine,
-        )
\ No newline at end of file
+            floor_number=floor_number,
+            rng=self.rng_for(floor_number, 'procgen'),
+        )
+
+    def generate_floor(self) -> None:
+        from procgen import build_dungeon, generate_layout
+
+        self.current_floor += 1
+        self._streams = {}
+
+        layout = self._take_pregenerated_layout(self.current_floor)
+        if layout is None:
+            layout = generate_layout(**self.layout_settings(self.current_floor))
+
+        self.engine.game_map = build_dungeon(layout, self.engine)
+        if self.layer_directory is not None:
+            self.engine.game_map.store_layers(self.layer_directory, f'floor-{self.current_floor}')
+
+        if self.pregenerate:
+            self._start_pregeneration(self.current_floor + 1)
+
+    def _start_pregeneration(self, floor_number: int) -> None:
+        from procgen import generate_layout
+
+        try:
+            future = _get_pregeneration_executor().submit(generate_layout, **self.layout_settings(floor_number))
+        except (OSError, RuntimeError):
+            # Floors will be generated synchronously instead.
+            traceback.print_exc()
+            self.pregenerate = False
+            return
+        self._pregenerated = floor_number, future
+
+    def _take_pregenerated_layout(self, floor_number: int) -> Optional[DungeonLayout]:
+        """Return the layout generated in the background for this floor, or None if it isn't ready."""
+        if self._pregenerated is None:
+            return None
+
+        pregenerated_floor, future = self._pregenerated
+        self._pregenerated = None
+        if pregenerated_floor != floor_number or not future.done():
+            future.cancel()
+            return None
+        if future.exception() is not None:
+            return None
+        return future.result()
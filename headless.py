@@ -0,0 +1,115 @@
+"""Drive an `Engine` without a window, tileset or event loop.
+
+Used to simulate many turns as fast as possible, e.g. on CI machines without a display:
+
+    python headless.py --turns 10000 --seed 1
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Callable, Optional
+
+import tcod
+
+import actions
+from actions import Action
+import color
+import consts
+from engine import Engine
+import exceptions
+import setup_game
+
+Policy = Callable[[Engine], Action]
+"""Chooses the next action for the player."""
+
+DIRECTIONS = [(-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1)]
+
+
+def wander_policy(rng: random.Random) -> Policy:
+    """Return a policy that takes the stairs when standing on them, and otherwise bumps in a random direction."""
+    def policy(engine: Engine) -> Action:
+        player = engine.player
+        if (player.x, player.y) == engine.game_map.downstairs_location:
+            return actions.TakeStairsAction(player)
+        return actions.BumpAction(player, *rng.choice(DIRECTIONS))
+    return policy
+
+
+class HeadlessDriver:
+    """Applies `Action` objects to an `Engine` directly, the same way `EventHandler.handle_action` does.
+
+    Rendering is skipped unless `render` is True, in which case every turn is drawn to an off-screen console.
+    """
+    def __init__(self, engine: Optional[Engine] = None, *, render: bool = False):
+        # Floors are generated synchronously, a worker process would compete with the simulation for CPU time.
+        self.engine = engine if engine is not None else setup_game.new_game(pregenerate=False)
+        self.console: Optional[tcod.Console] = None
+        if render:
+            self.console = tcod.Console(consts.SCREEN_WIDTH, consts.SCREEN_HEIGHT, order='F')
+        self.turns = 0
+
+    def perform(self, action: Action) -> bool:
+        """Perform `action` and let the enemies act.
+
+        Returns True if the action was valid and advanced a turn.
+        """
+        try:
+            action.perform()
+        except exceptions.Impossible as exc:
+            self.engine.message_log.add_message(exc.args[0], color.impossible)
+            return False
+
+        self.engine.end_turn()
+        self.turns += 1
+
+        if self.console is not None:
+            self.render()
+        return True
+
+    def render(self) -> tcod.Console:
+        """Draw the current game state to the off-screen console and return it."""
+        if self.console is None:
+            self.console = tcod.Console(consts.SCREEN_WIDTH, consts.SCREEN_HEIGHT, order='F')
+        self.console.clear()
+        self.engine.render(self.console)
+        return self.console
+
+    def run(self, turns: int, policy: Policy) -> int:
+        """Advance up to `turns` turns using `policy`, stopping early if the player dies.
+
+        Returns the number of turns that were advanced.
+        """
+        start = self.turns
+        attempts = 0
+        while self.turns - start < turns and self.engine.player.is_alive:
+            attempts += 1
+            if attempts > turns * 10:
+                break  # The policy keeps choosing impossible actions.
+            self.perform(policy(self.engine))
+        return self.turns - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Simulate turns without opening a window.')
+    parser.add_argument('--turns', type=int, default=1000, help='number of turns to simulate')
+    parser.add_argument('--seed', type=int, default=None, help='world seed, a random one is used if omitted')
+    parser.add_argument('--render', action='store_true', help='render every turn to an off-screen console')
+    args = parser.parse_args()
+
+    driver = HeadlessDriver(setup_game.new_game(seed=args.seed, pregenerate=False), render=args.render)
+    policy = wander_policy(random.Random(args.seed))
+
+    start_time = time.perf_counter()
+    turns = driver.run(args.turns, policy)
+    elapsed = time.perf_counter() - start_time
+
+    print(
+        f'{turns} turns in {elapsed:.3f}s ({turns / elapsed if elapsed else 0:.0f} turns/s), '
+        f'floor {driver.engine.game_world.current_floor}, player HP {driver.engine.player.fighter.hp}'
+    )
+
+
+if __name__ == '__main__':
+    main()
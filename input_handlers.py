@@ -1,7 +1,6 @@
 from __future__ import annotations
 
-import os
-from typing import Callable, Optional, Tuple, TYPE_CHECKING, Union
+from typing import Callable, Dict, List, Optional, Tuple, TYPE_CHECKING, Union
 
 import tcod.event
 
@@ -12,6 +11,7 @@ from actions import (
     WaitAction,
     PickUpAction,
 )
+import autosave
 import color
 import exceptions
 from entity import Actor, Item
@@ -19,6 +19,7 @@ from entity import Actor, Item
 
 if TYPE_CHECKING:
     from engine import Engine
+    from message_log import Message
 
 MOVE_KEYS = {
     # Arrow keys.
@@ -66,6 +67,14 @@ If an action is returned it will be attempted and if it's valid then MainGameEve
 """
 
 class BaseEventHandler(tcod.event.EventDispatch[ActionOrHandler]):
+    redraw = True
+    """True if what this handler shows changed since it was last rendered. A new handler always needs drawing."""
+
+    def dispatch(self, event: tcod.event.Event) -> Optional[ActionOrHandler]:
+        if not isinstance(event, tcod.event.MouseMotion):
+            self.redraw = True  # Anything but the mouse moving can change the screen, handlers decide for motion.
+        return super().dispatch(event)
+
     def handle_events(self, event: tcod.event.Event) -> BaseEventHandler:
         """Handle an event and return the next active event handler."""
         state = self.dispatch(event)
@@ -114,14 +123,17 @@ class EventHandler(BaseEventHandler):
             self.engine.message_log.add_message(exc.args[0], color.impossible)
             return False
 
-        self.engine.handle_enemy_turns()
-        self.engine.update_fov()
+        self.engine.end_turn()
         return True
 
 
     def ev_mousemotion(self, event: tcod.event.MouseMotion) -> None:
-        if self.engine.game_map.in_bounds(event.tile.x, event.tile.y):
-            self.engine.mouse_location = event.tile.x, event.tile.y
+        camera = self.engine.camera
+        x, y = camera.screen_to_world(event.tile.x, event.tile.y)
+        if camera.in_view(x, y) and self.engine.game_map.in_bounds(x, y):
+            if self.engine.mouse_location != (x, y):
+                self.engine.mouse_location = x, y
+                self.redraw = True
 
     def on_render(self, console: tcod.Console) -> None:
         self.engine.render(console)
@@ -175,8 +187,7 @@ class MainGameEventHandler(EventHandler):
 class GameOverEventHandler(EventHandler):
     def on_quit(self) -> None:
         """Handle exiting out of a finished game."""
-        if os.path.exists('savegame.sav'):
-            os.remove('savegame.sav')  # Deletes the active save
+        autosave.delete_save()
         raise exceptions.QuitWithoutSaving()
 
     def ev_quit(self, event: tcod.event.Quit) -> None:
@@ -191,8 +202,11 @@ class HistoryViewer(EventHandler):
     """Prints the message_log history on a larger window which can be navigates."""
     def __init__(self, engine: Engine):
         super().__init__(engine)
-        self.log_length = len(engine.message_log.messages)
+        self.log_length = len(engine.message_log)
         self.cursor = self.log_length - 1
+        # Messages read back from the archive, by index in the history.
+        # They keep their wrapped lines, so scrolling over them again doesn't read or wrap them again.
+        self._archived: Dict[int, Message] = {}
 
     def on_render(self, console: tcod.Console) -> None:
         super().on_render(console)  # Draw the main state as the background
@@ -204,17 +218,33 @@ class HistoryViewer(EventHandler):
             0, 0, log_console.width, 1, '┤Message history├', alignment=tcod.CENTER,
         )
 
-        # Render the message log using the cursor parameter
+        # Render the message log using the cursor parameter.
+        # Every message takes at least a line, so only as many messages as there are lines can be shown.
+        height = log_console.height - 2
         self.engine.message_log.render_messages(
             log_console,
             1,
             1,
             log_console.width - 2,
-            log_console.height - 2,
-            self.engine.message_log.messages[: self.cursor + 1],
+            height,
+            self.get_messages(self.cursor + 1 - height, self.cursor + 1),
         )
         log_console.blit(console, 3, 3)
 
+    def get_messages(self, start: int, stop: int) -> List[Message]:
+        """Return the messages from `start` to `stop` of the history, reading each archived one only once."""
+        message_log = self.engine.message_log
+        start = max(start, 0)
+        archived_stop = min(stop, message_log.archived_count)
+        missing = [i for i in range(start, archived_stop) if i not in self._archived]
+        if missing:
+            loaded = message_log.get_messages(missing[0], missing[-1] + 1)
+            for i, message in enumerate(loaded, start=missing[0]):
+                self._archived.setdefault(i, message)
+        messages = [self._archived[i] for i in range(start, archived_stop)]
+        messages.extend(message_log.get_messages(max(start, archived_stop), stop))
+        return messages
+
     def ev_keydown(self, event: tcod.event.KeyDown) -> Optional[MainGameEventHandler]:
         key = event.sym
         # Fancy conditional movement to make it feel right
@@ -372,9 +402,11 @@ class SelectIndexHandler(AskUserEventHandler):
     def on_render(self, console: tcod.Console) -> None:
         """Highlight the tile under the cursor."""
         super().on_render(console)
-        x, y = self.engine.mouse_location
-        console.tiles_rgb['bg'][x, y] = color.white
-        console.tiles_rgb['fg'][x, y] = color.black
+        camera = self.engine.camera
+        if camera.in_view(*self.engine.mouse_location):
+            x, y = camera.world_to_screen(*self.engine.mouse_location)
+            console.tiles_rgb['bg'][x, y] = color.white
+            console.tiles_rgb['fg'][x, y] = color.black
 
     def ev_keydown(self, event: tcod.event.KeyDown) -> Optional[ActionOrHandler]:
         """Chec kfor key movement or confirmation keys."""
@@ -392,9 +424,10 @@ class SelectIndexHandler(AskUserEventHandler):
             dx, dy = MOVE_KEYS[key]
             x += dx * modifier
             y += dy * modifier
-            # Clamp the cursor index to the map size.
-            x = max(0, min(x, self.engine.game_map.width - 1))
-            y = max(0, min(y, self.engine.game_map.height - 1))
+            # Clamp the cursor index to the part of the map in view.
+            camera = self.engine.camera
+            x = max(camera.x, 0, min(x, camera.x + camera.width - 1, self.engine.game_map.width - 1))
+            y = max(camera.y, 0, min(y, camera.y + camera.height - 1, self.engine.game_map.height - 1))
             self.engine.mouse_location = x, y
             return None
         elif key in CONFIRM_KEYS:
@@ -403,9 +436,11 @@ class SelectIndexHandler(AskUserEventHandler):
 
     def ev_mousebuttondown(self, event: tcod.event.MouseButtonDown) -> Optional[ActionOrHandler]:
         """Left click confirms a selection."""
-        if self.engine.game_map.in_bounds(*event.tile):
+        camera = self.engine.camera
+        x, y = camera.screen_to_world(*event.tile)
+        if camera.in_view(x, y) and self.engine.game_map.in_bounds(x, y):
             if event.button == 1:
-                return self.on_index_selected(*event.tile)
+                return self.on_index_selected(x, y)
         return super().ev_mousebuttondown(event)
 
     def on_index_selected(self, x: int, y: int) -> Optional[ActionOrHandler]:
@@ -445,7 +480,7 @@ class AreaRangedAttackHandler(SelectIndexHandler):
 
     def on_render(self, console: tcod.Console) -> None:
         super().on_render(console)
-        x, y = self.engine.mouse_location
+        x, y = self.engine.camera.world_to_screen(*self.engine.mouse_location)
 
         # Draw a rectangle around the targeted area, so the player can see the affected tiles
         console.draw_frame(
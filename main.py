@@ -1,7 +1,10 @@
+import time
 import traceback
+from typing import Iterable, Iterator
 
 import tcod
 
+import autosave
 import color
 import exceptions
 import input_handlers
@@ -12,9 +15,24 @@ import consts
 def save_game(handler: input_handlers.BaseEventHandler, filename: str) -> None:
     """if the current event handler has an active Engine then save it."""
     if isinstance(handler, input_handlers.EventHandler):
+        autosave.wait()  # Don't let an older autosave overwrite this one.
         handler.engine.save_as(filename)
         print('Game saved.')
 
+def coalesce_events(events: Iterable[tcod.event.Event]) -> Iterator[tcod.event.Event]:
+    """Yield `events`, skipping mouse motions followed by another motion, since only the last position matters."""
+    motion = None
+    for event in events:
+        if isinstance(event, tcod.event.MouseMotion):
+            motion = event
+            continue
+        if motion is not None:
+            yield motion
+            motion = None
+        yield event
+    if motion is not None:
+        yield motion
+
 def main():
     print('HELLO')
     tileset = tcod.tileset.load_tilesheet(
@@ -25,6 +43,7 @@ def main():
     )
 
     handler: input_handlers.BaseEventHandler = setup_game.MainMenu()
+    autosaver = autosave.Autosaver(consts.SAVE_FILENAME)
 
     with tcod.context.new_terminal(
         consts.SCREEN_WIDTH,
@@ -34,29 +53,47 @@ def main():
         vsync=True,
     ) as context:
         root_console = tcod.Console(consts.SCREEN_WIDTH, consts.SCREEN_HEIGHT, order='F')
+        frame_time = 1 / consts.FPS_CAP
+        next_frame = 0.0
         try:
             while True:
-                root_console.clear()
-                handler.on_render(console=root_console)
-                context.present(root_console)
+                # Only draw when the screen changed, and no more often than the FPS cap.
+                timeout = None
+                if handler.redraw:
+                    now = time.perf_counter()
+                    if now >= next_frame:
+                        root_console.clear()
+                        handler.on_render(console=root_console)
+                        context.present(root_console)
+                        handler.redraw = False
+                        next_frame = now + frame_time
+                    else:
+                        timeout = next_frame - now  # Keep handling events until the next frame is due.
 
                 try:
-                    for event in tcod.event.wait():
+                    for event in coalesce_events(tcod.event.wait(timeout)):
                         context.convert_event(event)
-                        handler = handler.handle_events(event)
+                        next_handler = handler.handle_events(event)
+                        if next_handler is not handler:
+                            next_handler.redraw = True  # Handlers can return to a parent drawn before.
+                            handler = next_handler
                 except Exception:
                     traceback.print_exc()
+                    handler.redraw = True
                     if isinstance(handler, input_handlers.EventHandler):
                         handler.engine.message_log.add_message(
                             traceback.format_exc(), color.error,
                         )
+
+                if isinstance(handler, input_handlers.EventHandler):
+                    autosaver.update(handler.engine)
         except exceptions.QuitWithoutSaving:
             raise
         except SystemExit:
-            save_game(handler, "savegame.sav")
+            save_game(handler, consts.SAVE_FILENAME)
             raise
         except BaseException:
-            save_game(handler, "savegame.sav")
+            save_game(handler, consts.SAVE_FILENAME)
             raise
 
 
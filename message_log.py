@@ -1,16 +1,34 @@
-from typing import Iterable, List, Reversible, Tuple
+from array import array
+from collections import deque
+import json
+import os
+import sys
+from typing import Deque, Iterable, List, Optional, Reversible, Tuple
 import textwrap
 
 import tcod
 
 import color
+from savefile import SavePath
 
 
 class Message:
+    __slots__ = ('plain_text', 'fg', 'count', '_wrapped')
+
     def __init__(self, text: str, fg: Tuple[int, int, int]):
         self.plain_text = text
         self.fg = fg
         self.count = 1
+        self._wrapped: Optional[Tuple[Tuple[int, int], List[str]]] = None
+
+    def __getstate__(self) -> Tuple[None, dict]:
+        return None, {'plain_text': self.plain_text, 'fg': self.fg, 'count': self.count}  # Without the wrap cache.
+
+    def __setstate__(self, state: Tuple[None, dict]) -> None:
+        _, slots = state
+        for name, value in slots.items():
+            setattr(self, name, value)
+        self._wrapped = None
 
     @property
     def full_text(self) -> str:
@@ -18,10 +36,39 @@ class Message:
             return f'{self.plain_text} (x{self.count})'
         return self.plain_text
 
+    def wrap(self, width: int) -> List[str]:
+        """Return the lines of `full_text` wrapped to `width`, cached until the width or the stack count changes."""
+        key = width, self.count
+        if self._wrapped is None or self._wrapped[0] != key:
+            self._wrapped = key, list(MessageLog.wrap(self.full_text, width))
+        return self._wrapped[1]
+
 
 class MessageLog:
-    def __init__(self) -> None:
-        self.messages: List[Message] = []
+    """The messages of a game.
+
+    Only the most recent messages are kept in `messages`. Once there are `capacity` of them the older half is moved to
+    the append-only `archive_filename`, one JSON array per line, or dropped if there is no archive.
+    The archive is kept next to the save, which references it by a path relative to the save file.
+    `get_messages` reads back any range of the whole history.
+    """
+    def __init__(self, archive_filename: Optional[str] = None, capacity: int = 1000) -> None:
+        self.messages: Deque[Message] = deque()
+        self.capacity = capacity
+        self.archive_filename = SavePath(archive_filename) if archive_filename is not None else None
+        # Offset in the archive of each archived message, and where the next one will be written.
+        # Anything after `_archive_end` was written after this log was saved, and is overwritten.
+        self._archive_offsets = array('q')
+        self._archive_end = 0
+
+    def __len__(self) -> int:
+        """Return the number of messages in the history, archived ones included."""
+        return len(self._archive_offsets) + len(self.messages)
+
+    @property
+    def archived_count(self) -> int:
+        """Return the number of messages moved to the archive, which are the oldest of the history."""
+        return len(self._archive_offsets)
 
     def add_message(
             self,
@@ -38,6 +85,46 @@ class MessageLog:
             self.messages[-1].count += 1
         else:
             self.messages.append(Message(text, fg))
+            if len(self.messages) >= self.capacity:
+                self._spill(len(self.messages) - self.capacity // 2)
+
+    def _spill(self, count: int) -> None:
+        """Move the `count` oldest messages from memory to the archive."""
+        old = [self.messages.popleft() for _ in range(count)]
+        if self.archive_filename is None:
+            return
+        with open(self.archive_filename, 'ab') as f:
+            if f.seek(0, os.SEEK_END) < self._archive_end:
+                # The archive is missing or belongs to another game. Writing to it would pad it up to `_archive_end`,
+                # leaving the archived offsets pointing at garbage, so stop archiving instead.
+                print(f'{self.archive_filename} is shorter than expected, older messages are dropped.', file=sys.stderr)
+                self.archive_filename = None
+                self._archive_offsets = array('q')
+                self._archive_end = 0
+                return
+            f.truncate(self._archive_end)
+            for message in old:
+                line = json.dumps([message.plain_text, message.fg, message.count]).encode() + b'\n'
+                f.write(line)
+                self._archive_offsets.append(self._archive_end)
+                self._archive_end += len(line)
+
+    def get_messages(self, start: int, stop: int) -> List[Message]:
+        """Return the messages from `start` to `stop` of the history, reading archived ones from disk."""
+        start, stop = max(start, 0), min(stop, len(self))
+        in_archive = range(start, min(stop, len(self._archive_offsets)))
+        messages = []
+        if in_archive:
+            with open(self.archive_filename, 'rb') as f:
+                for i in in_archive:
+                    f.seek(self._archive_offsets[i])
+                    text, fg, count = json.loads(f.readline())
+                    message = Message(text, tuple(fg))
+                    message.count = count
+                    messages.append(message)
+        first_in_memory = len(self) - len(self.messages)
+        messages.extend(self.messages[i - first_in_memory] for i in range(max(start, first_in_memory), stop))
+        return messages
 
     def render(
             self,
@@ -76,7 +163,7 @@ class MessageLog:
         y_offset = height - 1
 
         for message in reversed(messages):
-            for line in reversed(list(cls.wrap(message.full_text, width))):
+            for line in reversed(message.wrap(width)):
                 console.print(
                     x=x,
                     y=y + y_offset,
@@ -1,16 +1,16 @@
 from __future__ import annotations
 
 import random
-from typing import Dict, Iterator, List, Tuple, TYPE_CHECKING
+from typing import Dict, List, NamedTuple, Set, Tuple, TYPE_CHECKING
 from game_map import GameMap
 import entity_factory
 import tile_types
 
+import numpy as np
 import tcod
 
 if TYPE_CHECKING:
     from engine import Engine
-    from entity import Entity
 
 max_items_by_floor = [
     (1, 1),
@@ -24,28 +24,30 @@ max_monsters_per_floor = [
 ]
 
 # Note! Floor_number [(entity, chance)]
-item_chances: Dict[int, List[Tuple[Entity, int]]] = {
-    0: [(entity_factory.health_potion, 35), (entity_factory.sword, 50)],  # TEMP
-    # 0: [(entity_factory.health_potion, 35)],
-    2: [(entity_factory.confusion_scroll, 10)],
-    4: [(entity_factory.lightning_scroll, 25), (entity_factory.sword, 5)],
-    6: [(entity_factory.fireball_scroll, 25), (entity_factory.chainmail_armor, 15)],
+# Entities are named by their prototype in `entity_factory`, so generated floors can be sent between processes.
+item_chances: Dict[int, List[Tuple[str, int]]] = {
+    0: [('health_potion', 35), ('sword', 50)],  # TEMP
+    # 0: [('health_potion', 35)],
+    2: [('confusion_scroll', 10)],
+    4: [('lightning_scroll', 25), ('sword', 5)],
+    6: [('fireball_scroll', 25), ('chainmail_armor', 15)],
 }
 
 # Note! As the player descend, the chance of getting trolls increase
-enemy_chances: Dict[int, List[Tuple[Entity, int]]] = {
-    0: [(entity_factory.orc, 80)],
-    3: [(entity_factory.troll, 15)],
-    5: [(entity_factory.troll, 30)],
-    7: [(entity_factory.troll, 60)],
+enemy_chances: Dict[int, List[Tuple[str, int]]] = {
+    0: [('orc', 80)],
+    3: [('troll', 15)],
+    5: [('troll', 30)],
+    7: [('troll', 60)],
 }
 
 
 def get_entities_at_random(
-        weighted_chances_by_floor: Dict[int, List[Tuple[Entity, int]]],
+        weighted_chances_by_floor: Dict[int, List[Tuple[str, int]]],
         number_of_entities: int,
         floor: int,
-):
+        rng: random.Random,
+) -> List[str]:
     entity_weighted_chances = {}
 
     for key, values in weighted_chances_by_floor.items():
@@ -61,7 +63,7 @@ def get_entities_at_random(
     entities = list(entity_weighted_chances.keys())
     entity_weighted_chance_values = list(entity_weighted_chances.values())
 
-    chosen_entities = random.choices(
+    chosen_entities = rng.choices(
         entities,
         weights=entity_weighted_chance_values,
         k=number_of_entities,
@@ -116,6 +118,14 @@ class RectangularRoom:
         """
         return slice(self.x1 + 1, self.x2), slice(self.y1 + 1, self.y2)
 
+    @property
+    def outer(self) -> Tuple[slice, slice]:
+        """Return the area of the room including its walls.
+
+        Two rooms intersect exactly when their outer areas overlap.
+        """
+        return slice(self.x1, self.x2 + 1), slice(self.y1, self.y2 + 1)
+
     def intersects(self, other: RectangularRoom) -> bool:
         """Return True if this room overlaps with another RectangularRoom."""
         return (
@@ -126,89 +136,173 @@ class RectangularRoom:
         )
 
 
-# noinspection PyTypeChecker
 def tunnel_between(
         start: Tuple[int, int],
-        end: Tuple[int, int]
-) -> Iterator[Tuple[int, int]]:
+        end: Tuple[int, int],
+        rng: random.Random,
+) -> np.ndarray:
+    """Return the `(x, y)` coordinates of an L-shaped tunnel between two points, as an array of shape `(n, 2)`."""
     x1, y1 = start
     x2, y2 = end
 
-    if random.random() < 0.5:  # 50% chance
+    if rng.random() < 0.5:  # 50% chance
         # Move horizontally,then vertically
         corner_x, corner_y = x2, y1
     else:
         corner_x, corner_y = x1, y2
 
     # Generate coordinates for this tunnel.
-    for x, y in tcod.los.bresenham((x1, y1), (corner_x, corner_y)).tolist():
-        yield x, y
-    for x, y in tcod.los.bresenham((corner_x, corner_y), (x2, y2)).tolist():
-        yield x, y
+    return np.concatenate([
+        tcod.los.bresenham((x1, y1), (corner_x, corner_y)),
+        tcod.los.bresenham((corner_x, corner_y), (x2, y2)),
+    ])
+
+
+class DungeonLayout(NamedTuple):
+    """A generated floor as plain data, which is cheap to send between processes.
+
+    `carved` is a boolean mask of the floor tiles, and `spawns` lists the `entity_factory` prototype to spawn at each
+    position. `rooms` holds the inner area of each room as `(x1, y1, x2, y2)`, with `x2` and `y2` exclusive.
+    """
+    width: int
+    height: int
+    carved: np.ndarray
+    player_location: Tuple[int, int]
+    downstairs_location: Tuple[int, int]
+    spawns: List[Tuple[str, int, int]]
+    rooms: List[Tuple[int, int, int, int]]
 
 
 def place_entities(
         room: RectangularRoom,
-        dungeon: GameMap,
+        spawns: List[Tuple[str, int, int]],
+        occupied: Set[Tuple[int, int]],
         floor_number: int,
+        rng: random.Random,
 ) -> None:
-    """Attempts to place entity randomly in a room, if there's not entity in the randomly chosen position."""
-    number_of_monsters = random.randint(0, get_max_value_for_floor(max_monsters_per_floor, floor_number))
-    number_of_items = random.randint(0, get_max_value_for_floor(max_items_by_floor, floor_number))
+    """Attempts to place entity randomly in a room, if there's not entity in the randomly chosen position.
 
-    monsters: List[Entity] = get_entities_at_random(enemy_chances, number_of_monsters, floor_number)
-    items: List[Entity] = get_entities_at_random(item_chances, number_of_items, floor_number)
+    Chosen entities are appended to `spawns`, and their positions added to `occupied`.
+    """
+    number_of_monsters = rng.randint(0, get_max_value_for_floor(max_monsters_per_floor, floor_number))
+    number_of_items = rng.randint(0, get_max_value_for_floor(max_items_by_floor, floor_number))
 
-    for entity in monsters + items:
-        x = random.randint(room.x1 + 1, room.x2 - 1)
-        y = random.randint(room.y1 + 1, room.y2 - 1)
+    monsters = get_entities_at_random(enemy_chances, number_of_monsters, floor_number, rng)
+    items = get_entities_at_random(item_chances, number_of_items, floor_number, rng)
 
-        if not any(entity.x == x and entity.y == y for entity in dungeon.entities):
-            entity.spawn(dungeon, x, y)
+    for prototype in monsters + items:
+        x = rng.randint(room.x1 + 1, room.x2 - 1)
+        y = rng.randint(room.y1 + 1, room.y2 - 1)
 
-def generate_dungeon(
+        if (x, y) not in occupied:
+            spawns.append((prototype, x, y))
+            occupied.add((x, y))
+
+
+def generate_layout(
         *,
         map_width: int,
         map_height: int,
         max_rooms: int,
         room_min_size: int,
         room_max_size: int,
-        engine: Engine,
-) -> GameMap:
-    player = engine.player
-    dungeon = GameMap(engine, map_width, map_height, entities=[player])
+        floor_number: int,
+        rng: random.Random,
+) -> DungeonLayout:
+    """Generate the rooms, corridors and entity positions of a floor, without building a `GameMap`.
+
+    This doesn't touch the engine, so it can run in a worker process.
+    All randomness comes from `rng`, so the same stream always produces the same floor.
+    """
     rooms: List[RectangularRoom] = []
+    player_location = (0, 0)
     center_of_last_room = (0, 0)
+    spawns: List[Tuple[str, int, int]] = []
+    occupied_by_entities: Set[Tuple[int, int]] = set()
+
+    # Rooms are collected into masks and carved all at once at the end, instead of one tile at a time.
+    # `occupied` covers every room including its walls, so a new room can be tested against all of them at once.
+    occupied = np.zeros((map_width, map_height), dtype=bool, order='F')
+    carved = np.zeros((map_width, map_height), dtype=bool, order='F')
+    tunnels: List[np.ndarray] = []
 
     for i in range(max_rooms):
-        room_width = random.randint(room_min_size, room_max_size)
-        room_height = random.randint(room_min_size, room_max_size)
+        room_width = rng.randint(room_min_size, room_max_size)
+        room_height = rng.randint(room_min_size, room_max_size)
 
-        x = random.randint(0, dungeon.width - room_width - 1)
-        y = random.randint(0, dungeon.height - room_height - 1)
+        x = rng.randint(0, map_width - room_width - 1)
+        y = rng.randint(0, map_height - room_height - 1)
 
         # `RectangularRoom` class makes rectangles easier to work with
         new_room = RectangularRoom(x, y, room_width, room_height)
 
-        if any(new_room.intersects(other_room) for other_room in rooms):
+        if occupied[new_room.outer].any():
             continue
 
-        dungeon.tiles[new_room.inner] = tile_types.floor
+        occupied[new_room.outer] = True
+        carved[new_room.inner] = True
 
         if len(rooms) == 0:
             # First room generated
-            player.place(*new_room.center, dungeon)
+            player_location = new_room.center
+            occupied_by_entities.add(player_location)
         else:
-            for x, y in tunnel_between(rooms[-1].center, new_room.center):
-                dungeon.tiles[x, y] = tile_types.floor
+            tunnels.append(tunnel_between(rooms[-1].center, new_room.center, rng))
 
             center_of_last_room = new_room.center
 
-        place_entities(new_room, dungeon, engine.game_world.current_floor)
-
-        dungeon.tiles[center_of_last_room] = tile_types.down_stairs
-        dungeon.downstairs_location = center_of_last_room
+        place_entities(new_room, spawns, occupied_by_entities, floor_number, rng)
 
         rooms.append(new_room)
+
+    if tunnels:
+        tunnel_x, tunnel_y = np.concatenate(tunnels).T
+        carved[tunnel_x, tunnel_y] = True
+
+    return DungeonLayout(
+        width=map_width,
+        height=map_height,
+        carved=carved,
+        player_location=player_location,
+        downstairs_location=center_of_last_room,
+        spawns=spawns,
+        rooms=[(room.x1 + 1, room.y1 + 1, room.x2, room.y2) for room in rooms],
+    )
+
+
+def build_dungeon(layout: DungeonLayout, engine: Engine) -> GameMap:
+    """Build a `GameMap` from a generated layout, and move the player onto it."""
+    dungeon = GameMap(engine, layout.width, layout.height)  # The player is added when placed below.
+
+    dungeon.set_tiles(layout.carved, tile_types.floor)
+    dungeon.set_tiles(layout.downstairs_location, tile_types.down_stairs)
+    dungeon.downstairs_location = layout.downstairs_location
+    dungeon.set_rooms(layout.rooms)
+
+    engine.player.place(*layout.player_location, dungeon)
+    for prototype, x, y in layout.spawns:
+        getattr(entity_factory, prototype).spawn(dungeon, x, y)
+
     return dungeon
 
+
+def generate_dungeon(
+        *,
+        map_width: int,
+        map_height: int,
+        max_rooms: int,
+        room_min_size: int,
+        room_max_size: int,
+        engine: Engine,
+) -> GameMap:
+    floor_number = engine.game_world.current_floor
+    layout = generate_layout(
+        map_width=map_width,
+        map_height=map_height,
+        max_rooms=max_rooms,
+        room_min_size=room_min_size,
+        room_max_size=room_max_size,
+        floor_number=floor_number,
+        rng=engine.game_world.rng_for(floor_number, 'procgen'),
+    )
+    return build_dungeon(layout, engine)
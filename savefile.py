@@ -0,0 +1,205 @@
+"""Versioned save file container.
+
+A save file is made of separately compressed sections:
+
+- the object graph of the `Engine`, pickled without its large NumPy arrays,
+- one section per large array, holding its raw buffer.
+
+Arrays are referenced from the pickle by their section number, and are read back as `np.frombuffer` views
+of the decompressed data instead of going through the generic pickle path.
+
+Memory-mapped arrays already live in their own file, and are referenced by filename instead, relative to
+`directory`, the directory of the save file. Saving only flushes their changes to disk, and loading maps the file
+again, so they must be moved together with the save.
+Other files kept next to the save are referenced with `SavePath`, which is resolved the same way.
+
+Layout::
+
+    MAGIC, uint32 version, uint32 manifest size, JSON manifest, section data...
+"""
+from __future__ import annotations
+
+import io
+import json
+import lzma
+import mmap
+import os
+import pickle
+import struct
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+MAGIC = b'TCRLSAVE'
+VERSION = 2
+
+ARRAY_SECTION_MIN_BYTES = 4096
+"""Arrays smaller than this are left inside the pickled object graph."""
+
+COMPRESSION_PRESET = 1
+"""LZMA preset for every section. Map data is repetitive enough that higher presets are much slower for little gain."""
+
+_HEADER = struct.Struct('<8sII')
+
+
+class SaveFormatError(Exception):
+    """Raised when a file isn't a save file this version can read."""
+
+
+class SavePath(str):
+    """The filename of a file kept next to the save, such as the message archive.
+
+    It is saved relative to the directory of the save file, and loaded back relative to the directory of the save file
+    being loaded, so the save can be loaded from any working directory.
+    """
+
+
+class _ArrayPickler(pickle.Pickler):
+    """Pickles an object graph, moving large arrays out into `arrays`."""
+    def __init__(self, file: io.BytesIO, directory: str):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.directory = directory or os.curdir
+        self.arrays: List[np.ndarray] = []
+        self._array_ids: Dict[int, int] = {}
+
+    def persistent_id(self, obj: Any) -> Any:
+        if type(obj) is SavePath:
+            return 'path', os.path.relpath(obj, self.directory)
+        if isinstance(obj, np.memmap) and isinstance(obj.base, mmap.mmap):
+            obj.flush()
+            return (
+                'memmap',
+                os.path.relpath(obj.filename, self.directory),
+                np.lib.format.dtype_to_descr(obj.dtype),
+                obj.shape,
+                'F' if obj.flags.f_contiguous and not obj.flags.c_contiguous else 'C',
+                obj.offset,
+            )
+        if type(obj) is not np.ndarray or obj.nbytes < ARRAY_SECTION_MIN_BYTES or obj.dtype.hasobject:
+            return None
+        index = self._array_ids.get(id(obj))
+        if index is None:
+            index = self._array_ids[id(obj)] = len(self.arrays)
+            self.arrays.append(obj)
+        return 'array', index
+
+
+class _ArrayUnpickler(pickle.Unpickler):
+    def __init__(self, file: io.BytesIO, arrays: List[np.ndarray], directory: str):
+        super().__init__(file)
+        self.arrays = arrays
+        self.directory = directory
+
+    def persistent_load(self, pid: Any) -> Any:
+        kind, *args = pid
+        if kind == 'array':
+            index, = args
+            return self.arrays[index]
+        if kind == 'path':
+            filename, = args
+            return SavePath(os.path.join(self.directory, filename))
+        if kind == 'memmap':
+            filename, descr, shape, order, offset = args
+            dtype = np.lib.format.descr_to_dtype(descr)
+            filename = os.path.join(self.directory, filename)
+            return np.memmap(filename, dtype=dtype, mode='r+', offset=offset, shape=tuple(shape), order=order)
+        raise pickle.UnpicklingError(f'Unknown persistent id {pid!r}.')
+
+
+class Snapshot(NamedTuple):
+    """An object graph captured for saving, which no longer shares any mutable state with the game.
+
+    Taking a snapshot is quick, the slow compression happens in `encode`, which is safe to run on another thread.
+    """
+    objects: bytes
+    arrays: List[np.ndarray]
+
+
+def snapshot(obj: Any, *, directory: str = '', copy_arrays: bool = True) -> Snapshot:
+    """Pickle `obj` and capture its large arrays.
+
+    `directory` is where the save file will be written, memory-mapped arrays are referenced relative to it.
+    If `copy_arrays` is True then writable arrays are copied, so the game can keep changing them while
+    the snapshot is encoded. Read-only arrays can't change and are never copied.
+    """
+    objects = io.BytesIO()
+    pickler = _ArrayPickler(objects, directory)
+    pickler.dump(obj)
+
+    arrays = pickler.arrays
+    if copy_arrays:
+        arrays = [array.copy(order='K') if array.flags.writeable else array for array in arrays]
+    return Snapshot(objects.getvalue(), arrays)
+
+
+def encode(snapshot: Snapshot) -> bytes:
+    """Compress a snapshot into save file data."""
+    sections: List[Tuple[Dict[str, Any], bytes]] = [
+        ({'name': 'objects'}, lzma.compress(snapshot.objects, preset=COMPRESSION_PRESET)),
+    ]
+    for index, array in enumerate(snapshot.arrays):
+        order = 'F' if array.flags.f_contiguous and not array.flags.c_contiguous else 'C'
+        info = {
+            'name': f'array/{index}',
+            'dtype': np.lib.format.dtype_to_descr(array.dtype),
+            'shape': list(array.shape),
+            'order': order,
+        }
+        sections.append((info, lzma.compress(array.tobytes(order=order), preset=COMPRESSION_PRESET)))
+
+    for info, data in sections:
+        info['size'] = len(data)
+    manifest = json.dumps({'sections': [info for info, _ in sections]}).encode()
+
+    return b''.join([_HEADER.pack(MAGIC, VERSION, len(manifest)), manifest, *(data for _, data in sections)])
+
+
+def dumps(obj: Any, directory: str = '') -> bytes:
+    """Return `obj` serialized as a save file, to be written in `directory`."""
+    return encode(snapshot(obj, directory=directory, copy_arrays=False))
+
+
+def write_file(filename: str, data: bytes) -> None:
+    """Write `data` to `filename` atomically, so a crash never leaves a partly written save behind."""
+    temporary_filename = f'{filename}.tmp'
+    with open(temporary_filename, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary_filename, filename)
+
+
+def is_save_data(data: bytes) -> bool:
+    """Return True if `data` starts like a save file of this format."""
+    return data[:len(MAGIC)] == MAGIC
+
+
+def loads(data: bytes, directory: str = '') -> Any:
+    """Return the object stored in save file `data`, read from `directory`.
+
+    Arrays are returned as read-only views over the decompressed section data.
+    Memory-mapped arrays are mapped again from their files, relative to `directory`.
+    """
+    if len(data) < _HEADER.size or not is_save_data(data):
+        raise SaveFormatError('Not a save file, or a save from an older version of the game.')
+    _, version, manifest_size = _HEADER.unpack_from(data)
+    if version > VERSION:
+        raise SaveFormatError(f'Save file version {version} is newer than this game supports ({VERSION}).')
+
+    view = memoryview(data)
+    offset = _HEADER.size + manifest_size
+    manifest = json.loads(bytes(view[_HEADER.size:offset]))
+
+    objects = b''
+    arrays: List[np.ndarray] = []
+    for info in manifest['sections']:
+        raw = lzma.decompress(view[offset:offset + info['size']])
+        offset += info['size']
+        if info['name'] == 'objects':
+            objects = raw
+        else:
+            dtype = np.lib.format.descr_to_dtype(info['dtype'])
+            arrays.append(np.frombuffer(raw, dtype=dtype).reshape(info['shape'], order=info['order']))
+
+    return _ArrayUnpickler(io.BytesIO(objects), arrays, directory).load()
+
@@ -0,0 +1,77 @@
+"""Turn order of the actors of a `GameMap`.
+
+Time is counted in ticks. An actor with a speed of `NORMAL_SPEED` acts once every `TURN_TIME` ticks,
+a faster actor acts more often, and a slower one less often.
+The actors waiting to act are kept in buckets by the time of their next action, with a heap of those times,
+so a turn only visits the actors which are due, in a deterministic order.
+Actors due at the same time act in the order they were scheduled.
+"""
+from __future__ import annotations
+
+import heapq
+from typing import Dict, List, Tuple, TYPE_CHECKING
+
+import exceptions
+
+if TYPE_CHECKING:
+    from entity import Actor
+
+NORMAL_SPEED = 100
+TURN_TIME = 100
+
+
+def action_time(actor: Actor) -> int:
+    """Return the number of ticks an action takes `actor`."""
+    return max(1, TURN_TIME * NORMAL_SPEED // actor.speed)
+
+
+class Scheduler:
+    def __init__(self) -> None:
+        self.time = 0
+        self._times: List[int] = []  # Heap of the keys of `_buckets`.
+        self._buckets: Dict[int, List[Tuple[int, Actor]]] = {}
+        # Sequence number of the current queue entry of each scheduled actor.
+        # Entries of removed or rescheduled actors are left in their bucket, and skipped once they come up.
+        self._entries: Dict[Actor, int] = {}
+        self._next_sequence = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, actor: Actor) -> bool:
+        return actor in self._entries
+
+    def add(self, actor: Actor, delay: int = -1) -> None:
+        """Schedule `actor` to act after `delay` ticks, by default after the time of one of its actions."""
+        if delay < 0:
+            delay = action_time(actor)
+        sequence = self._next_sequence
+        self._next_sequence += 1
+        self._entries[actor] = sequence
+        time = self.time + delay
+        bucket = self._buckets.get(time)
+        if bucket is None:
+            bucket = self._buckets[time] = []
+            heapq.heappush(self._times, time)
+        bucket.append((sequence, actor))
+
+    def remove(self, actor: Actor) -> None:
+        """Stop scheduling `actor`, doing nothing if it wasn't scheduled."""
+        self._entries.pop(actor, None)
+
+    def advance(self, ticks: int) -> None:
+        """Let the time pass by `ticks`, making every actor due within that time act in turn."""
+        end = self.time + ticks
+        times = self._times
+        entries = self._entries
+        while times and times[0] <= end:
+            self.time = heapq.heappop(times)
+            for sequence, actor in self._buckets.pop(self.time):
+                if entries.get(actor) != sequence:
+                    continue  # Removed or rescheduled since this entry was added.
+                self.add(actor)
+                try:
+                    actor.ai.perform()
+                except exceptions.Impossible:
+                    pass
+        self.time = end
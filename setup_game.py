@@ -1,36 +1,57 @@
 from __future__ import annotations
 
-import copy
-import lzma
+import os
 import pickle
 import traceback
 from typing import Optional
 
 import tcod
 
+import autosave
 import color
 from consts import *
 from engine import Engine
 import entity_factory
 from game_map import GameWorld
 import input_handlers
+import savefile
 
 
 
 background_image = tcod.image.load('menu_background.png')[:, :, :3]
 # background_image = tcod.image.load('menu_background.png')[:, :, :3]
 
-def new_game() -> Engine:
-    player = copy.deepcopy(entity_factory.player)
-    engine = Engine(player=player)
+def new_game(
+        *,
+        map_width: int = MAP_WIDTH,
+        map_height: int = MAP_HEIGHT,
+        max_rooms: int = ROOM_MAX_ROOMS,
+        pregenerate: bool = True,
+        seed: Optional[int] = None,
+        message_archive: Optional[str] = None,
+        layer_directory: Optional[str] = None,
+) -> Engine:
+    """Return a brand new game session as an Engine instance.
+
+    The map settings default to the values in `consts`, and can be overridden for simulations and benchmarks.
+    `pregenerate` controls whether the next floor is generated in a background process.
+    The same `seed` always produces the same world, a random one is picked if it's None.
+    Old messages are moved to the `message_archive` file, or forgotten if it's None.
+    The map layers of each floor are stored in files in `layer_directory`, or kept in memory if it's None.
+    """
+    player = entity_factory.player.build()
+    engine = Engine(player=player, message_archive=message_archive)
 
     engine.game_world = GameWorld(
-        max_rooms=ROOM_MAX_ROOMS,
+        max_rooms=max_rooms,
         room_min_size=ROOM_MIN_SIZE,
         room_max_size=ROOM_MAX_SIZE,
-        map_width=MAP_WIDTH,
-        map_height=MAP_HEIGHT,
+        map_width=map_width,
+        map_height=map_height,
         engine=engine,
+        pregenerate=pregenerate,
+        seed=seed,
+        layer_directory=layer_directory,
     )
     engine.game_world.generate_floor()
     engine.update_fov()
@@ -40,8 +61,8 @@ def new_game() -> Engine:
         color.welcome_text,
     )
 
-    dagger = copy.deepcopy(entity_factory.dagger)
-    leather_armor = copy.deepcopy(entity_factory.leather_armor)
+    dagger = entity_factory.dagger.build()
+    leather_armor = entity_factory.leather_armor.build()
 
     dagger.parent = player.inventory
     leather_armor.parent = player.inventory
@@ -55,10 +76,16 @@ def new_game() -> Engine:
 
 
 def load_game(filename: str) -> Engine:
-    """Attempts to load an Engine instance from a file."""
+    """Attempts to load an Engine instance from a file.
+
+    Raises `savefile.SaveFormatError` for files which aren't save files of this game,
+    including saves made before the sectioned save format, which can't be loaded.
+    """
     with open(filename, 'rb') as f:
-        engine = pickle.loads(lzma.decompress(f.read()))
-    assert isinstance(engine, Engine)
+        save_data = f.read()
+    engine = savefile.loads(save_data, os.path.dirname(filename))
+    if not isinstance(engine, Engine):
+        raise savefile.SaveFormatError('The save file does not hold a game.')
     return engine
 
 class MainMenu(input_handlers.BaseEventHandler):
@@ -102,10 +129,16 @@ class MainMenu(input_handlers.BaseEventHandler):
             raise SystemExit(0)
         elif event.sym == tcod.event.K_c:
             try:
-                return input_handlers.MainGameEventHandler(load_game('savegame.sav'))
-            except FileNotFoundError as exc:
+                return input_handlers.MainGameEventHandler(load_game(SAVE_FILENAME))
+            except (
+                FileNotFoundError, savefile.SaveFormatError, pickle.UnpicklingError, AttributeError,
+            ) as exc:
                 traceback.print_exc()
                 return input_handlers.PopupMessage(self, f'Failed to load save:\n{exc}')
         elif event.sym == tcod.event.K_n:
-            return input_handlers.MainGameEventHandler(new_game())
+            # The new game reuses the names of the files of the saved one, which would no longer match them.
+            autosave.delete_save()
+            return input_handlers.MainGameEventHandler(new_game(
+                message_archive=MESSAGE_ARCHIVE_FILENAME, layer_directory=LAYER_DIRECTORY,
+            ))
         return None
\ No newline at end of file
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The game's modules live at the root of the repository, next to this directory.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,86 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from chunked_array import ChunkedArray
+import tile_types
+
+TILES = np.array([tile_types.wall, tile_types.floor, tile_types.down_stairs])
+FIELDS = ('walkable', 'transparent', 'dark', 'light')
+
+
+def random_index(rng: np.random.Generator, width: int, height: int):
+    """Return a random index of each kind `GameMap.tiles` is indexed with."""
+    kind = rng.integers(5)
+    if kind == 0:
+        return int(rng.integers(-width, width)), int(rng.integers(-height, height))
+    if kind == 1:
+        x1, x2 = sorted(rng.integers(0, width + 1, 2).tolist())
+        y1, y2 = sorted(rng.integers(0, height + 1, 2).tolist())
+        return np.s_[x1:x2, y1:y2]
+    if kind == 2:
+        return rng.random((width, height)) < 0.3
+    if kind == 3:
+        count = int(rng.integers(0, 50))
+        return rng.integers(0, width, count), rng.integers(0, height, count)
+    return int(rng.integers(0, width)), np.s_[int(rng.integers(0, height)):]
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_matches_dense_array(seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    width, height = rng.integers(1, 150, 2).tolist()
+    chunk_size = int(rng.choice([4, 7, 16, 64]))
+    dense = np.full((width, height), tile_types.wall, order='F')
+    chunked = ChunkedArray((width, height), tile_types.wall, chunk_size=chunk_size)
+
+    for _ in range(30):
+        index = random_index(rng, width, height)
+        if rng.random() < 0.5:
+            value = TILES[rng.integers(len(TILES))]
+        else:
+            value = TILES[rng.integers(0, len(TILES), np.shape(dense[index]))]
+        dense[index] = value
+        chunked[index] = value
+
+        read = random_index(rng, width, height)
+        np.testing.assert_array_equal(chunked[read], dense[read])
+        for field in FIELDS:
+            np.testing.assert_array_equal(chunked[field][read], dense[field][read])
+
+    np.testing.assert_array_equal(np.asarray(chunked), dense)
+    np.testing.assert_array_equal(np.nonzero(chunked['walkable']), np.nonzero(dense['walkable']))
+
+
+def test_unwritten_chunks_are_not_allocated() -> None:
+    chunked = ChunkedArray((4000, 4000), tile_types.wall)
+    assert chunked[3999, 3999] == tile_types.wall
+    assert not chunked['walkable'][100:300, 100:300].any()
+    assert chunked.allocated_chunks == 0
+
+    chunked[10:20, 10:20] = tile_types.floor
+    assert chunked.allocated_chunks == 1
+    assert chunked['walkable'][10:20, 10:20].all()
+
+
+def test_pickle_round_trip() -> None:
+    rng = np.random.default_rng(0)
+    chunked = ChunkedArray((100, 70), tile_types.wall, chunk_size=16)
+    chunked[rng.random((100, 70)) < 0.2] = tile_types.floor
+    chunked[5, 5] = tile_types.down_stairs
+
+    loaded = pickle.loads(pickle.dumps(chunked, protocol=5))
+    np.testing.assert_array_equal(np.asarray(loaded), np.asarray(chunked))
+    assert loaded.allocated_chunks == chunked.allocated_chunks
+
+    loaded[0, 0] = tile_types.down_stairs
+    assert chunked[0, 0] != tile_types.down_stairs
+
+
+def test_out_of_bounds_index() -> None:
+    chunked = ChunkedArray((10, 10), tile_types.wall)
+    with pytest.raises(IndexError):
+        chunked[10, 0]
+    with pytest.raises(IndexError):
+        chunked[np.array([0, 11]), np.array([0, 0])]
@@ -0,0 +1,72 @@
+import math
+from typing import Tuple
+
+import pytest
+
+from engine import Engine
+import entity_factory
+from game_map import GameMap
+import tile_types
+
+
+def make_map(width: int = 30, height: int = 20) -> Tuple[Engine, GameMap]:
+    player = entity_factory.player.build()
+    engine = Engine(player)
+    game_map = GameMap(engine, width, height)
+    game_map.set_tiles((slice(None), slice(None)), tile_types.floor)
+    engine.game_map = game_map
+    player.place(10, 10, game_map)
+    return engine, game_map
+
+
+def names(entities) -> list:
+    return sorted(entity.name for entity in entities)
+
+
+def test_entities_at_and_in_rect() -> None:
+    engine, game_map = make_map()
+    orc = entity_factory.orc.spawn(game_map, 12, 10)
+    potion = entity_factory.health_potion.spawn(game_map, 12, 10)
+    assert names(game_map.entities_at(12, 10)) == names([orc, potion])
+    assert names(game_map.entities_in_rect(11, 9, 13, 11)) == names([orc, potion])
+    assert names(game_map.entities_in_rect(-5, -5, 50, 50)) == names([engine.player, orc, potion])
+    assert list(game_map.entities_in_rect(0, 0, 5, 5)) == []
+
+    orc.move(1, 1)
+    assert names(game_map.entities_at(12, 10)) == [potion.name]
+    assert game_map.get_blocking_entity_at_location(13, 11) is orc
+    assert game_map.get_actor_at_location(13, 11) is orc
+
+
+@pytest.mark.parametrize('count', [1, 2, 3, 4])
+def test_entities_in_radius_with_stacked_entities(count: int) -> None:
+    # Every count of entities on a tile must be found, not only odd ones.
+    engine, game_map = make_map()
+    stacked = [entity_factory.health_potion.spawn(game_map, 10, 10) for _ in range(count - 1)]
+    found = list(game_map.entities_in_radius(10, 10, 3))
+    assert names(found) == names([engine.player, *stacked])
+
+
+def test_entities_in_radius_matches_distance() -> None:
+    engine, game_map = make_map()
+    for x in range(0, 30, 3):
+        for y in range(0, 20, 2):
+            entity_factory.health_potion.spawn(game_map, x, y)
+            entity_factory.health_potion.spawn(game_map, x, y)
+    for radius in (0, 1, 2.5, 4, 7.9):
+        for x, y in ((10, 10), (0, 0), (29, 19), (3, 17)):
+            expected = [entity for entity in game_map.entities if math.hypot(entity.x - x, entity.y - y) <= radius]
+            assert sorted(map(id, game_map.entities_in_radius(x, y, radius))) == sorted(map(id, expected))
+
+
+def test_noise_wakes_monster_standing_on_corpse() -> None:
+    engine, game_map = make_map()
+    corpse = entity_factory.orc.spawn(game_map, 14, 10)
+    corpse.fighter.die()
+    sleeper = entity_factory.orc.spawn(game_map, 14, 10)
+    game_map.sleep(sleeper)
+    assert sleeper not in game_map.scheduler
+
+    game_map.make_noise(12, 10, 3)
+    assert sleeper in game_map.scheduler
+    assert corpse not in game_map.scheduler
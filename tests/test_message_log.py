@@ -0,0 +1,52 @@
+import os
+import shutil
+
+import savefile
+from message_log import MessageLog
+
+
+def make_log(directory: str) -> MessageLog:
+    log = MessageLog(archive_filename=os.path.join(directory, 'messages.jsonl'), capacity=10)
+    for i in range(25):
+        log.add_message(f'Message {i}')
+    return log
+
+
+def texts(log: MessageLog) -> list:
+    return [message.plain_text for message in log.get_messages(0, len(log))]
+
+
+def test_history_spans_archive(tmp_path) -> None:
+    log = make_log(str(tmp_path))
+    assert log.archived_count > 0
+    assert texts(log) == [f'Message {i}' for i in range(25)]
+
+
+def test_archive_moves_with_save(tmp_path, monkeypatch) -> None:
+    saved = tmp_path / 'saved'
+    saved.mkdir()
+    monkeypatch.chdir(saved)
+    data = savefile.dumps(make_log('.'), '.')
+
+    moved = tmp_path / 'moved'
+    shutil.copytree(saved, moved)
+    shutil.rmtree(saved)
+    monkeypatch.chdir(tmp_path)
+    log = savefile.loads(data, str(moved))
+
+    assert os.path.samefile(log.archive_filename, moved / 'messages.jsonl')
+    assert texts(log) == [f'Message {i}' for i in range(25)]
+
+
+def test_short_archive_is_not_padded(tmp_path, capsys) -> None:
+    log = savefile.loads(savefile.dumps(make_log(str(tmp_path)), str(tmp_path)), str(tmp_path))
+    archive = tmp_path / 'messages.jsonl'
+    archive.write_bytes(b'')
+
+    for i in range(25, 35):
+        log.add_message(f'Message {i}')
+
+    assert archive.read_bytes() == b''
+    assert log.archive_filename is None
+    assert log.archived_count == 0
+    assert 'shorter than expected' in capsys.readouterr().err
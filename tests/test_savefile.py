@@ -0,0 +1,98 @@
+import os
+import struct
+
+import numpy as np
+import pytest
+
+import savefile
+import tile_types
+
+
+def test_round_trip() -> None:
+    shared = np.arange(5000, dtype=np.int32)
+    obj = {
+        'tiles': np.full((80, 43), tile_types.wall, order='F'),
+        'explored': np.zeros((200, 100), dtype=bool),
+        'small': np.arange(10),
+        'shared': [shared, shared],
+        'text': 'hello',
+    }
+    obj['tiles'][3:7, 5:9] = tile_types.floor
+
+    loaded = savefile.loads(savefile.dumps(obj))
+
+    assert loaded['text'] == 'hello'
+    for name in ('tiles', 'explored', 'small'):
+        np.testing.assert_array_equal(loaded[name], obj[name])
+        assert loaded[name].dtype == obj[name].dtype
+    assert loaded['tiles'].flags.f_contiguous
+    assert loaded['shared'][0] is loaded['shared'][1]
+    np.testing.assert_array_equal(loaded['shared'][0], shared)
+    # Large arrays are views of the save data.
+    assert not loaded['tiles'].flags.writeable
+
+
+def test_snapshot_copies_writable_arrays() -> None:
+    array = np.zeros(10000, dtype=np.uint8)
+    snapshot = savefile.snapshot({'array': array})
+    array[:] = 1
+    loaded = savefile.loads(savefile.encode(snapshot))
+    assert not loaded['array'].any()
+
+
+@pytest.mark.parametrize('data', [b'', b'garbage', b'\xfd7zXZ\x00' + bytes(100)])
+def test_rejects_other_files(data: bytes) -> None:
+    with pytest.raises(savefile.SaveFormatError):
+        savefile.loads(data)
+
+
+def test_rejects_newer_version() -> None:
+    data = bytearray(savefile.dumps({}))
+    struct.pack_into('<I', data, len(savefile.MAGIC), savefile.VERSION + 1)
+    with pytest.raises(savefile.SaveFormatError):
+        savefile.loads(bytes(data))
+
+
+def test_write_file_replaces_atomically(tmp_path) -> None:
+    filename = str(tmp_path / 'game.sav')
+    savefile.write_file(filename, b'old')
+    savefile.write_file(filename, savefile.dumps({'turn': 3}))
+    assert os.listdir(tmp_path) == ['game.sav']
+    with open(filename, 'rb') as f:
+        assert savefile.loads(f.read()) == {'turn': 3}
+
+
+def open_layer(filename: str) -> np.memmap:
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    return np.lib.format.open_memmap(filename, mode='w+', dtype=bool, shape=(300, 200), fortran_order=True)
+
+
+def test_memmap_is_referenced_by_file(tmp_path) -> None:
+    explored = open_layer(str(tmp_path / 'floors' / 'floor-1.explored.npy'))
+    snapshot = savefile.snapshot({'explored': explored}, directory=str(tmp_path))
+    assert snapshot.arrays == []
+
+    explored[10:20, 30:40] = True
+    savefile.dumps({'explored': explored}, str(tmp_path))  # Saving flushes the changes to the file.
+    np.testing.assert_array_equal(np.load(tmp_path / 'floors' / 'floor-1.explored.npy'), explored)
+
+
+def test_memmap_loads_from_another_working_directory(tmp_path, monkeypatch) -> None:
+    save_directory = tmp_path / 'game'
+    monkeypatch.chdir(tmp_path)
+    explored = open_layer(os.path.join('game', 'floors', 'floor-1.explored.npy'))
+    explored[5, 7] = True
+    data = savefile.dumps({'explored': explored}, 'game')
+    del explored
+
+    other_directory = tmp_path / 'elsewhere'
+    other_directory.mkdir()
+    monkeypatch.chdir(other_directory)
+    loaded = savefile.loads(data, str(save_directory))['explored']
+
+    assert isinstance(loaded, np.memmap)
+    assert loaded.flags.writeable and loaded.flags.f_contiguous
+    assert loaded.shape == (300, 200) and loaded[5, 7] and loaded.sum() == 1
+    loaded[8, 9] = True
+    savefile.dumps({'explored': loaded}, str(save_directory))
+    assert np.load(save_directory / 'floors' / 'floor-1.explored.npy')[8, 9]
@@ -0,0 +1,113 @@
+from typing import Callable, List, Optional, Tuple
+
+import exceptions
+from scheduler import NORMAL_SPEED, TURN_TIME, Scheduler, action_time
+
+
+class StubAI:
+    def __init__(self, actor: 'StubActor'):
+        self.actor = actor
+
+    def perform(self) -> None:
+        actor = self.actor
+        actor.turns.append((actor.scheduler.time, actor.name))
+        if actor.on_turn:
+            actor.on_turn()
+
+
+class StubActor:
+    """The part of an `Actor` the scheduler uses: its speed and its AI."""
+    def __init__(
+            self, name: str, scheduler: Scheduler, turns: List[Tuple[int, str]], speed: int = NORMAL_SPEED,
+    ):
+        self.name = name
+        self.speed = speed
+        self.scheduler = scheduler
+        self.turns = turns
+        self.ai = StubAI(self)
+        self.on_turn: Optional[Callable[[], None]] = None
+
+
+def make_actors(scheduler: Scheduler, *speeds: int) -> Tuple[List[Tuple[int, str]], List[StubActor]]:
+    turns: List[Tuple[int, str]] = []
+    actors = [StubActor(str(i), scheduler, turns, speed) for i, speed in enumerate(speeds)]
+    for actor in actors:
+        scheduler.add(actor)
+    return turns, actors
+
+
+def test_action_time() -> None:
+    scheduler = Scheduler()
+    _, (normal, fast, slow, instant) = make_actors(scheduler, NORMAL_SPEED, 2 * NORMAL_SPEED, NORMAL_SPEED // 2, 10 ** 9)
+    assert action_time(normal) == TURN_TIME
+    assert action_time(fast) == TURN_TIME // 2
+    assert action_time(slow) == TURN_TIME * 2
+    assert action_time(instant) == 1
+
+
+def test_turn_order_follows_speed() -> None:
+    scheduler = Scheduler()
+    turns, _ = make_actors(scheduler, NORMAL_SPEED, 2 * NORMAL_SPEED, NORMAL_SPEED // 2)
+    for _ in range(4):
+        scheduler.advance(TURN_TIME)
+    assert scheduler.time == 4 * TURN_TIME
+    assert turns == [
+        (50, '1'),
+        (100, '0'), (100, '1'),
+        (150, '1'),
+        (200, '2'), (200, '0'), (200, '1'),
+        (250, '1'),
+        (300, '0'), (300, '1'),
+        (350, '1'),
+        (400, '2'), (400, '0'), (400, '1'),
+    ]
+
+
+def test_ties_act_in_scheduling_order() -> None:
+    scheduler = Scheduler()
+    turns, _ = make_actors(scheduler, *[NORMAL_SPEED] * 5)
+    scheduler.advance(TURN_TIME)
+    scheduler.advance(TURN_TIME)
+    assert [name for _, name in turns] == ['0', '1', '2', '3', '4'] * 2
+
+
+def test_removed_actor_does_not_act() -> None:
+    scheduler = Scheduler()
+    turns, (first, second) = make_actors(scheduler, NORMAL_SPEED, NORMAL_SPEED)
+    scheduler.remove(first)
+    scheduler.remove(first)  # Removing an actor which isn't scheduled does nothing.
+    assert first not in scheduler and len(scheduler) == 1
+    scheduler.advance(3 * TURN_TIME)
+    assert turns == [(100, '1'), (200, '1'), (300, '1')]
+
+
+def test_rescheduled_actor_acts_once() -> None:
+    scheduler = Scheduler()
+    turns, (actor,) = make_actors(scheduler, NORMAL_SPEED)
+    scheduler.remove(actor)
+    scheduler.add(actor, delay=30)  # Its stale entry at 100 is skipped.
+    scheduler.add(actor, delay=60)  # As is the one at 30.
+    scheduler.advance(TURN_TIME)
+    assert turns == [(60, '0')]
+    assert len(scheduler) == 1
+
+
+def test_actor_removed_during_a_turn() -> None:
+    scheduler = Scheduler()
+    turns, (killer, victim) = make_actors(scheduler, NORMAL_SPEED, NORMAL_SPEED)
+    killer.on_turn = lambda: scheduler.remove(victim)
+    scheduler.advance(2 * TURN_TIME)
+    assert turns == [(100, '0'), (200, '0')]
+
+
+def test_impossible_actions_are_skipped() -> None:
+    scheduler = Scheduler()
+    turns, (actor,) = make_actors(scheduler, NORMAL_SPEED)
+
+    def fail() -> None:
+        raise exceptions.Impossible('Blocked.')
+
+    actor.on_turn = fail
+    scheduler.advance(2 * TURN_TIME)
+    assert turns == [(100, '0'), (200, '0')]
+    assert actor in scheduler